@@ -1,9 +1,26 @@
 #!/usr/bin/env python3
 """Bad Robot Poetry Generator - Markov chains making weird poetry."""
 
-from collections import defaultdict
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict, defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+import argparse
+import codecs
+import hashlib
+import json
+import mmap
+import multiprocessing
+import os
 import random
+import struct
+import sys
+import re
 import textwrap
+import time
+import weakref
 
 # Sample corpus mixing Shakespeare, Poe, and cooking recipes for maximum chaos
 CORPUS = """
@@ -45,41 +62,1184 @@ the batter of destiny into peaks stiff with determination
 """
 
 
+CHUNK_SIZE = 1 << 20  # Characters read per chunk when streaming a corpus file
+
+TITLES = [
+    "Ode to a Preheated Void",
+    "The Raven's Recipe",
+    "Sonnet for a Mixing Bowl",
+    "Dreams at 350 Degrees",
+    "Nevermore (Serves 4)",
+    "To Bake or Not to Bake",
+    "Midnight in the Kitchen",
+    "The Buttered Soul",
+]
+
+# Constrained poem forms: syllables per line, and lines sharing a letter rhyme
+FORMS = {
+    "haiku": {"syllables": (5, 7, 5)},
+    "couplets": {"syllables": (8, 8, 8, 8), "rhyme": "AABB"},
+    "limerick": {"syllables": (8, 8, 5, 5, 8), "rhyme": "AABBA"},
+}
+
+# Poem server
+DEFAULT_PORT = 8765
+MAX_BATCH = 10000  # Largest batch a single server request may ask for
+MAX_LINES = 100  # Longest poem a server request may ask for
+MAX_WORDS_PER_LINE = 100
+MAX_REQUEST_WORDS = 1_000_000  # count * lines * words_per_line per request
+REACH_CACHE_SIZE = 64  # (budget, allowed endings) tables kept per PoemIndex
+
+# Compiled model cache
+CACHE_DIR = Path.home() / ".cache" / "bad-poetry"
+MODEL_MAGIC = b"BPGM"
+MODEL_VERSION = 2
+MODEL_HEADER = struct.Struct("<4s7I")  # magic, version, order, words, states, edges, starts, vocab bytes
+
+
+def iter_words(source, chunk_size=CHUNK_SIZE):
+    """Yield lowercased words from a file path or an iterable of text chunks.
+
+    Chunks may end mid-word; the partial word is carried into the next chunk.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding='utf-8') as f:
+            yield from iter_words(iter(lambda: f.read(chunk_size), ''))
+        return
+
+    carry = ''
+    for chunk in source:
+        if not chunk:
+            continue
+        words = (carry + chunk).split()
+        carry = '' if chunk[-1].isspace() else words.pop()
+        for word in words:
+            yield sys.intern(word.lower())
+    if carry:
+        yield sys.intern(carry.lower())
+
+
+def count_ngrams(words, order=2, chain=None):
+    """Add every `order`-word window and its successor in `words` to a chain."""
+    if chain is None:
+        chain = defaultdict(Counter)
+    window = deque(maxlen=order)
+    for word in words:
+        if len(window) == order:
+            chain[tuple(window)][word] += 1
+        window.append(word)
+    return chain
+
+
+def build_chain_stream(source, order=2, chain=None):
+    """Build (or extend) a Markov chain from a corpus file or iterable of text.
+
+    Successor counts are updated in place as words stream by, so memory is
+    bounded by the size of the chain rather than the corpus. The `order`-word
+    window carries across chunk and line boundaries.
+    """
+    return count_ngrams(iter_words(source), order, chain)
+
+
+def _shard_bounds(path, shards):
+    """Split a file into byte ranges that start and end on ASCII whitespace."""
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, 'rb') as f:
+        for i in range(1, shards):
+            pos = max(size * i // shards, bounds[-1])
+            f.seek(pos)
+            while True:
+                byte = f.read(1)
+                if not byte or byte.isspace():
+                    break
+                pos += 1
+            bounds.append(pos)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _count_shard(task):
+    """Pool worker: count one shard's n-grams and report its edge words."""
+    path, start, end, order = task
+    head = []
+    tail = deque(maxlen=order)
+
+    def chunks():
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        with open(path, 'rb') as f:
+            f.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                data = f.read(min(CHUNK_SIZE, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                yield decoder.decode(data)
+        yield decoder.decode(b'', final=True)
+
+    def tap(words):
+        for word in words:
+            if len(head) < order:
+                head.append(word)
+            tail.append(word)
+            yield word
+
+    chain = count_ngrams(tap(iter_words(chunks())), order)
+    return NgramTable.from_chain(chain, order, head, list(tail))
+
+
+class NgramTable:
+    """A compact chain for shipping between processes: word ids and flat counts.
+
+    `rows` holds order+1 word ids per entry (the window, then its successor)
+    and `counts` the matching counts, both grouped by window in the order a
+    serial build would insert them. `head` and `tail` are the first and last
+    `order` words of the text the table covers, for stitching neighbours.
+    """
+
+    def __init__(self, order, vocab, rows, counts, head, tail):
+        self.order = order
+        self.vocab = vocab
+        self.rows = rows
+        self.counts = counts
+        self.head = head
+        self.tail = tail
+
+    @classmethod
+    def from_chain(cls, chain, order, head, tail):
+        vocab = []
+        word_ids = {}
+        rows = array('I')
+        counts = array('Q')
+        for key, followers in chain.items():
+            key_ids = []
+            for word in key:
+                if word not in word_ids:
+                    word_ids[word] = len(vocab)
+                    vocab.append(word)
+                key_ids.append(word_ids[word])
+            for word, count in followers.items():
+                if word not in word_ids:
+                    word_ids[word] = len(vocab)
+                    vocab.append(word)
+                rows.extend(key_ids)
+                rows.append(word_ids[word])
+                counts.append(count)
+        return cls(order, vocab, rows, counts, head, tail)
+
+    def to_chain(self):
+        """Expand into the `build_chain` dict of Counters."""
+        import numpy as np
+
+        chain = defaultdict(Counter)
+        if not len(self.counts):
+            return chain
+        rows = np.asarray(self.rows, dtype=np.uint32).reshape(-1, self.order + 1)
+        vocab = np.array([sys.intern(word) for word in self.vocab], dtype=object)
+        # Rows are grouped by window, so each run of equal windows is one Counter
+        starts = np.flatnonzero(np.any(rows[1:, :-1] != rows[:-1, :-1], axis=1)) + 1
+        bounds = [0, *starts.tolist(), len(rows)]
+        keys = vocab[rows[bounds[:-1], :-1]].tolist()
+        successors = vocab[rows[:, -1]].tolist()
+        counts = np.asarray(self.counts, dtype=np.int64).tolist()
+        for key, lo, hi in zip(keys, bounds, bounds[1:]):
+            chain[tuple(key)] = Counter(dict(zip(successors[lo:hi], counts[lo:hi])))
+        return chain
+
+
+def _pack_rows(rows, vocab_size):
+    """One sortable scalar per row of word ids, for `np.unique`."""
+    import numpy as np
+
+    bits = max(1, (vocab_size - 1).bit_length())
+    if bits * rows.shape[1] > 64:
+        return np.ascontiguousarray(rows).view(np.dtype((np.void, 4 * rows.shape[1]))).ravel()
+    packed = np.zeros(len(rows), dtype=np.uint64)
+    for column in range(rows.shape[1]):
+        packed = (packed << np.uint64(bits)) | rows[:, column].astype(np.uint64)
+    return packed
+
+
+def _first_occurrences(values):
+    """Indices of the first occurrence of each distinct value, in order."""
+    import numpy as np
+
+    _, first = np.unique(values, return_index=True)
+    is_first = np.zeros(len(values), dtype=bool)
+    is_first[first] = True
+    return np.flatnonzero(is_first)
+
+
+def _merge_tables(pair):
+    """Pool worker: merge two neighbouring NgramTables (left comes first in the file).
+
+    The right table's word ids are remapped into the left vocabulary, the
+    windows straddling the seam are added, and duplicate entries are summed,
+    all as array operations. Entries keep serial insertion order: windows
+    by first appearance, then successors by first appearance.
+    """
+    import numpy as np
+
+    left, right = pair
+    order, width = left.order, left.order + 1
+    vocab = list(left.vocab)
+    word_ids = {word: i for i, word in enumerate(vocab)}
+
+    def intern(word):
+        if word not in word_ids:
+            word_ids[word] = len(vocab)
+            vocab.append(word)
+        return word_ids[word]
+
+    remap = np.fromiter((intern(word) for word in right.vocab), np.uint32, len(right.vocab))
+    # Windows that start in the left text and end in the right one
+    junction = left.tail + right.head
+    seam = [intern(word) for i in range(min(len(left.tail), len(junction) - order))
+            for word in junction[i:i + width]]
+
+    rows = np.concatenate([
+        np.asarray(left.rows, dtype=np.uint32).reshape(-1, width),
+        np.array(seam, dtype=np.uint32).reshape(-1, width),
+        remap[np.asarray(right.rows, dtype=np.uint32)].reshape(-1, width),
+    ])
+    counts = np.concatenate([
+        np.asarray(left.counts, dtype=np.int64),
+        np.ones(len(seam) // width, dtype=np.int64),
+        np.asarray(right.counts, dtype=np.int64),
+    ])
+
+    packed = _pack_rows(rows, len(vocab))
+    windows = _pack_rows(rows[:, :order], len(vocab))
+    _, first, inverse = np.unique(packed, return_index=True, return_inverse=True)
+    totals = np.bincount(inverse.ravel(), weights=counts, minlength=len(first)).astype(np.int64)
+    _, window_first, window_inverse = np.unique(windows, return_index=True, return_inverse=True)
+    ranks = np.lexsort((first, window_first[window_inverse.ravel()[first]]))
+
+    return NgramTable(
+        order,
+        vocab,
+        rows[first[ranks]],
+        totals[ranks],
+        (left.head + right.head)[:order],
+        (left.tail + right.tail)[-order:],
+    )
+
+
+def build_table_parallel(path, order=2, processes=None):
+    """Count a corpus file's n-grams across a process pool into one NgramTable.
+
+    Each worker counts one whitespace-aligned shard and sends back a compact
+    table. Neighbouring tables are then merged pairwise, as a tree, across
+    the same pool, so no single process merges every shard.
+    """
+    processes = processes or os.cpu_count() or 1
+    tasks = [(path, start, end, order) for start, end in _shard_bounds(path, processes)]
+
+    with multiprocessing.Pool(processes) as pool:
+        tables = pool.map(_count_shard, tasks)
+        while len(tables) > 1:
+            merged = pool.map(_merge_tables, list(zip(tables[0::2], tables[1::2])))
+            if len(tables) % 2:
+                merged.append(tables[-1])
+            tables = merged
+    return tables[0]
+
+
+def build_chain_parallel(path, order=2, processes=None):
+    """Build a chain from a corpus file using a process pool (needs NumPy).
+
+    The result equals `build_chain_stream(path, order)`, including insertion
+    order. Windows that straddle shard boundaries are rebuilt from each
+    table's first and last `order` words as neighbouring tables merge.
+    """
+    return build_table_parallel(path, order, processes).to_chain()
+
+
 def build_chain(text, order=2):
     """Build a Markov chain from text with given order."""
-    words = text.lower().split()
-    chain = defaultdict(list)
-    for i in range(len(words) - order):
-        key = tuple(words[i:i + order])
-        chain[key].append(words[i + order])
-    return chain
+    return build_chain_stream([text], order)
+
+
+class CompiledChain:
+    """A Markov chain compiled to integer tokens and flat arrays.
+
+    Words are interned into `vocab`, and every n-gram state gets an integer
+    ID. The outgoing edges of state `s` are `offsets[s]:offsets[s + 1]`
+    (CSR layout). Each edge is one distinct (successor, count) transition and
+    stores its successor word ID, the cumulative weight within the state, the
+    ID of the state it leads to, and a Vose alias-table entry (`alias_prob`
+    as a 32-bit threshold, `alias` as an edge index) for O(1) sampling.
+    States that have successors are numbered first and listed in
+    `start_states`.
+    """
+
+    def __init__(self, order, vocab, state_words, offsets, successors,
+                 cum_weights, next_state, start_states, alias_prob, alias):
+        self.order = order
+        self.vocab = vocab
+        self.state_words = state_words
+        self.offsets = offsets
+        self.successors = successors
+        self.cum_weights = cum_weights
+        self.next_state = next_state
+        self.start_states = start_states
+        self.alias_prob = alias_prob
+        self.alias = alias
+
+    def __len__(self):
+        return len(self.start_states)
+
+    def sample_edge(self, state, rng=random):
+        """Pick an outgoing edge of `state` by weight, or -1 if it has none."""
+        lo, hi = self.offsets[state], self.offsets[state + 1]
+        if lo == hi:
+            return -1
+        edge = lo + rng.randrange(hi - lo)
+        if rng.getrandbits(32) < self.alias_prob[edge]:
+            return edge
+        return self.alias[edge]
+
+    def walk(self, max_words, rng=random):
+        """Random walk from a random start state, returning word IDs."""
+        order = self.order
+        state = self.start_states[rng.randrange(len(self.start_states))]
+        output = list(self.state_words[state * order:(state + 1) * order])
+        for _ in range(max_words - order):
+            edge = self.sample_edge(state, rng)
+            if edge < 0:
+                break
+            output.append(self.successors[edge])
+            state = self.next_state[edge]
+        return output
+
+
+def build_alias_table(weights, lo, alias_prob, alias):
+    """Append a Vose alias table for integer `weights` (edges lo, lo + 1, ...).
+
+    Bucket i keeps its own edge when a uniform 32-bit draw is below
+    alias_prob[i], and otherwise takes alias[i].
+    """
+    n = len(weights)
+    total = sum(weights)
+    scaled = [w * n for w in weights]  # Compared against `total` to stay exact
+    small = [i for i, w in enumerate(scaled) if w < total]
+    large = [i for i, w in enumerate(scaled) if w >= total]
+    prob = [0xFFFFFFFF] * n
+    other = list(range(n))
+    while small and large:
+        s, g = small.pop(), large[-1]
+        prob[s] = (scaled[s] << 32) // total
+        other[s] = g
+        scaled[g] -= total - scaled[s]
+        if scaled[g] < total:
+            small.append(large.pop())
+    alias_prob.extend(prob)
+    alias.extend(lo + i for i in other)
+
+
+def compile_chain(chain):
+    """Compile a `build_chain` dict of successor counts into a CompiledChain."""
+    order = len(next(iter(chain), ()))
+    vocab = []
+    word_ids = {}
+    state_ids = {}
+
+    def intern(word):
+        if word not in word_ids:
+            word_ids[word] = len(vocab)
+            vocab.append(word)
+        return word_ids[word]
+
+    def state_id(key):
+        if key not in state_ids:
+            state_ids[key] = len(state_ids)
+        return state_ids[key]
+
+    # States with successors come first so they double as the start states
+    for key in chain:
+        state_id(tuple(intern(word) for word in key))
+
+    offsets = array('I', [0])
+    successors = array('I')
+    cum_weights = array('I')
+    next_state = array('I')
+    alias_prob = array('I')
+    alias = array('I')
+    for key, followers in chain.items():
+        key_ids = tuple(word_ids[word] for word in key)
+        build_alias_table(list(followers.values()), len(successors), alias_prob, alias)
+        total = 0
+        for word, count in followers.items():
+            word_id = intern(word)
+            total += count
+            successors.append(word_id)
+            cum_weights.append(total)
+            next_state.append(state_id(key_ids[1:] + (word_id,)))
+        offsets.append(len(successors))
+
+    # Dead-end states (seen only as a final window) have no edges
+    offsets.extend([len(successors)] * (len(state_ids) - len(chain)))
+
+    state_words = array('I')
+    for key_ids in state_ids:
+        state_words.extend(key_ids)
+
+    return CompiledChain(
+        order=order,
+        vocab=vocab,
+        state_words=state_words,
+        offsets=offsets,
+        successors=successors,
+        cum_weights=cum_weights,
+        next_state=next_state,
+        start_states=array('I', range(len(chain))),
+        alias_prob=alias_prob,
+        alias=alias,
+    )
+
+
+def compile_table(table):
+    """Compile an NgramTable into the CompiledChain `compile_chain` would give.
+
+    Interning and state numbering are done with array operations instead of
+    going through a dict of Counters; only states with several successors
+    run the Python alias-table builder.
+    """
+    import numpy as np
+
+    order = table.order
+    rows = np.asarray(table.rows, dtype=np.uint32).reshape(-1, order + 1)
+    counts = np.asarray(table.counts, dtype=np.int64)
+    starts = np.flatnonzero(np.any(rows[1:, :-1] != rows[:-1, :-1], axis=1)) + 1
+    bounds = np.concatenate([[0], starts, [len(rows)]]) if len(rows) else np.zeros(1, np.int64)
+    keys = rows[bounds[:-1], :-1]
+    sizes = np.diff(bounds)
+
+    # Word ids in first-appearance order: every key's words, then successors
+    seen = np.concatenate([keys.ravel(), rows[:, -1]])
+    words = seen[_first_occurrences(seen)]
+    remap = np.zeros(len(table.vocab), dtype=np.uint32)
+    remap[words] = np.arange(len(words), dtype=np.uint32)
+    rows = remap[rows]
+    keys = remap[keys]
+
+    # Key states take ids 0..K-1; states only reached as a successor follow
+    windows = np.concatenate([keys, rows[:, 1:]])
+    packed = _pack_rows(windows, len(words))
+    _, first, inverse = np.unique(packed, return_index=True, return_inverse=True)
+    is_first = np.zeros(len(windows), dtype=bool)
+    is_first[first] = True
+    state_ids = (np.cumsum(is_first) - 1)[first][inverse.ravel()]
+    state_words = windows[is_first]
+
+    cum_weights = np.cumsum(counts)
+    cum_weights -= np.repeat(cum_weights[bounds[:-1]] - counts[bounds[:-1]], sizes)
+
+    # One-successor states keep their only edge; the rest get Vose tables
+    alias_prob = np.full(len(rows), 0xFFFFFFFF, dtype=np.uint32)
+    alias = np.arange(len(rows), dtype=np.uint32)
+    shared = np.repeat(sizes > 1, sizes)
+    probs, others = array('I'), array('I')
+    count_list = counts.tolist()
+    for lo, hi in zip(bounds[:-1][sizes > 1].tolist(), bounds[1:][sizes > 1].tolist()):
+        build_alias_table(count_list[lo:hi], lo, probs, others)
+    alias_prob[shared] = probs
+    alias[shared] = others
+
+    def packed(values):
+        return array('I', np.ascontiguousarray(values, dtype=np.uint32).tobytes())
+
+    offsets = np.concatenate([bounds, np.full(len(state_words) - len(keys), len(rows))])
+    return CompiledChain(
+        order=order,
+        vocab=[table.vocab[i] for i in words.tolist()],
+        state_words=packed(state_words.ravel()),
+        offsets=packed(offsets),
+        successors=packed(rows[:, -1]),
+        cum_weights=packed(cum_weights),
+        next_state=packed(state_ids[len(keys):]),
+        start_states=array('I', range(len(keys))),
+        alias_prob=packed(alias_prob),
+        alias=packed(alias),
+    )
+
+
+class BackoffModel:
+    """N-gram counts for every order up to `order`, in an array-backed trie.
+
+    Level d of the trie holds all d-grams in sorted order, as three parallel
+    arrays: last word ID, count, and cumulative count within the sibling
+    group. `first_child[d]` maps each level-d node to its children's range in
+    level d + 1, so a context lookup is one bisect per word. Every node costs
+    the same fixed number of bytes, so memory is predictable from the n-gram
+    counts (see `memory_bytes`).
+    """
+
+    def __init__(self, order, vocab, words, counts, cum_counts, first_child):
+        self.order = order
+        self.vocab = vocab
+        self.words = words
+        self.counts = counts
+        self.cum_counts = cum_counts
+        self.first_child = first_child
+
+    def __len__(self):
+        return len(self.words[1])
+
+    @classmethod
+    def from_counts(cls, order, vocab, grams, min_count=1):
+        """Freeze `grams[d]` (Counter of d-gram tuples, d = 1..order + 1) into arrays.
+
+        N-grams of two or more words seen fewer than `min_count` times are
+        dropped. An n-gram is never more frequent than its prefix, so the trie
+        stays prefix-closed.
+        """
+        words = [array('I')]
+        counts = [array('I')]
+        cum_counts = [array('I')]
+        first_child = []
+        parents = [()]
+        for d in range(1, order + 2):
+            nodes = sorted(g for g, n in grams[d].items() if d == 1 or n >= min_count)
+            words.append(array('I', (g[-1] for g in nodes)))
+            counts.append(array('I', (grams[d][g] for g in nodes)))
+
+            children = array('I')
+            cum = array('I')
+            j = 0
+            for parent in parents:
+                children.append(j)
+                total = 0
+                while j < len(nodes) and nodes[j][:-1] == parent:
+                    total += grams[d][nodes[j]]
+                    cum.append(total)
+                    j += 1
+            children.append(j)
+            first_child.append(children)
+            cum_counts.append(cum)
+            parents = nodes
+
+        return cls(order, vocab, words, counts, cum_counts, first_child)
+
+    def memory_bytes(self):
+        """Bytes used by the trie arrays (excluding the vocabulary)."""
+        arrays = self.words + self.counts + self.cum_counts + self.first_child
+        return sum(a.itemsize * len(a) for a in arrays)
+
+    def find(self, context):
+        """Trie node index of a context at level len(context), or -1 if unseen."""
+        node = 0
+        for depth, word in enumerate(context):
+            lo, hi = self.first_child[depth][node], self.first_child[depth][node + 1]
+            node = bisect_left(self.words[depth + 1], word, lo, hi)
+            if node == hi or self.words[depth + 1][node] != word:
+                return -1
+        return node
+
+    def sample_next(self, history, rng=random):
+        """Sample the next word ID, backing off to shorter contexts as needed."""
+        for k in range(min(self.order, len(history)), -1, -1):
+            node = self.find(history[len(history) - k:])
+            if node < 0:
+                continue
+            lo, hi = self.first_child[k][node], self.first_child[k][node + 1]
+            if lo == hi:
+                continue
+            cum = self.cum_counts[k + 1]
+            edge = bisect_right(cum, rng.randrange(cum[hi - 1]), lo, hi)
+            return self.words[k + 1][edge]
+        return -1
 
+    def start(self, rng=random):
+        """Word IDs of a random longest-order context (empty for an empty corpus)."""
+        if not self.words[1]:
+            return []
+        depth = self.order
+        while depth > 1 and not self.words[depth]:
+            depth -= 1
+        node = rng.randrange(len(self.words[depth]))
+        path = []
+        for d in range(depth, 0, -1):
+            path.append(self.words[d][node])
+            # Parent is the node whose child range contains this one
+            node = bisect_right(self.first_child[d - 1], node) - 1
+        return path[::-1]
 
-def generate_line(chain, max_words=12):
+    def walk(self, max_words, rng=random):
+        """Random walk that never stops early while unigrams exist."""
+        output = self.start(rng)
+        while len(output) < max_words:
+            word = self.sample_next(output, rng)
+            if word < 0:
+                break
+            output.append(word)
+        return output
+
+
+def build_backoff_model(source, order=3, min_count=1):
+    """Count every n-gram up to `order` words of context from a corpus stream.
+
+    `source` is a file path or an iterable of text, as for build_chain_stream.
+    """
+    vocab = []
+    word_ids = {}
+    grams = [None] + [Counter() for _ in range(order + 1)]
+    window = deque(maxlen=order + 1)
+    for word in iter_words(source):
+        word_id = word_ids.get(word)
+        if word_id is None:
+            word_id = word_ids[word] = len(vocab)
+            vocab.append(word)
+        window.append(word_id)
+        ngram = tuple(window)
+        for d in range(1, len(ngram) + 1):
+            grams[d][ngram[-d:]] += 1
+    return BackoffModel.from_counts(order, vocab, grams, min_count)
+
+
+class MappedVocab:
+    """Read-only word list over a UTF-8 blob plus an offsets array.
+
+    Words are decoded on access, so opening a cached model doesn't have to
+    touch the whole vocabulary.
+    """
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        return str(self.blob[self.offsets[index]:self.offsets[index + 1]], 'utf-8')
+
+
+def save_model(model, path):
+    """Write a CompiledChain to a binary model file (atomically)."""
+    words = [word.encode('utf-8') for word in model.vocab]
+    vocab_offsets = array('I', [0])
+    for word in words:
+        vocab_offsets.append(vocab_offsets[-1] + len(word))
+
+    n_states = len(model.offsets) - 1
+    header = MODEL_HEADER.pack(
+        MODEL_MAGIC, MODEL_VERSION, model.order, len(words), n_states,
+        len(model.successors), len(model.start_states), vocab_offsets[-1],
+    )
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, 'wb') as f:
+        f.write(header)
+        for values in (vocab_offsets, model.state_words, model.offsets, model.successors,
+                       model.cum_weights, model.next_state, model.start_states,
+                       model.alias_prob, model.alias):
+            f.write(array('I', values).tobytes())
+        f.write(b''.join(words))
+    os.replace(tmp, path)
+
+
+def load_model(path):
+    """Memory-map a binary model file as a CompiledChain.
+
+    The arrays are zero-copy views into the mapping, so loading costs about
+    the same no matter how big the model is.
+    """
+    with open(path, 'rb') as f:
+        view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    magic, version, order, n_words, n_states, n_edges, n_starts, vocab_bytes = \
+        MODEL_HEADER.unpack_from(view)
+    if magic != MODEL_MAGIC or version != MODEL_VERSION:
+        raise ValueError(f"{path} is not a version {MODEL_VERSION} poetry model")
+
+    pos = MODEL_HEADER.size
+
+    def take(count):
+        nonlocal pos
+        size = count * array('I').itemsize
+        values = view[pos:pos + size].cast('I')
+        pos += size
+        return values
+
+    vocab_offsets = take(n_words + 1)
+    state_words = take(n_states * order)
+    offsets = take(n_states + 1)
+    successors = take(n_edges)
+    cum_weights = take(n_edges)
+    next_state = take(n_edges)
+    start_states = take(n_starts)
+    alias_prob = take(n_edges)
+    alias = take(n_edges)
+    blob = view[pos:pos + vocab_bytes]
+
+    return CompiledChain(
+        order=order,
+        vocab=MappedVocab(vocab_offsets, blob),
+        state_words=state_words,
+        offsets=offsets,
+        successors=successors,
+        cum_weights=cum_weights,
+        next_state=next_state,
+        start_states=start_states,
+        alias_prob=alias_prob,
+        alias=alias,
+    )
+
+
+def corpus_digest(order, path=None):
+    """Hash the corpus (a file, or the built-in CORPUS) together with `order`.
+
+    File digests are remembered per (path, size, mtime) in CACHE_DIR so an
+    unchanged corpus isn't re-read on every launch.
+    """
+    key = hashlib.blake2b(digest_size=16)
+    key.update(f"{MODEL_VERSION}:{order}:{sys.byteorder}:".encode())
+    if path is None:
+        key.update(CORPUS.encode('utf-8'))
+        return key.hexdigest()
+
+    stat = os.stat(path)
+    stamp = f"{os.path.realpath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    index_file = CACHE_DIR / "digests.json"
+    try:
+        index = json.loads(index_file.read_text())
+    except (OSError, ValueError):
+        index = {}
+
+    if stamp not in index:
+        content = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(CHUNK_SIZE), b''):
+                content.update(block)
+        index[stamp] = content.hexdigest()
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        index_file.write_text(json.dumps(index))
+
+    key.update(index[stamp].encode())
+    return key.hexdigest()
+
+
+def cached_model(order=2, path=None, jobs=1):
+    """Load the compiled model for a corpus from the cache, building it on a miss."""
+    model_file = CACHE_DIR / f"{corpus_digest(order, path)}.model"
+    if model_file.exists():
+        return load_model(model_file)
+
+    if path is None:
+        model = compile_chain(build_chain(CORPUS, order=order))
+    elif jobs > 1:
+        model = compile_table(build_table_parallel(path, order=order, processes=jobs))
+    else:
+        model = compile_chain(build_chain_stream(path, order=order))
+    save_model(model, model_file)
+    return model
+
+
+VOWEL_GROUPS = re.compile(r"[aeiouy]+")
+
+
+def count_syllables(word):
+    """Rough English syllable count: vowel groups, minus a silent final 'e'."""
+    word = re.sub(r"[^a-z]", "", word.lower())
+    groups = VOWEL_GROUPS.findall(word)
+    count = len(groups)
+    if word.endswith("e") and not word.endswith(("le", "ee")) and count > 1 and groups[-1] == "e":
+        count -= 1
+    return max(1, count)
+
+
+def rhyme_key(word):
+    """Spelling-based rhyme class: the last vowel sound and everything after it.
+
+    A silent final 'e' is kept with the vowel before it, so "fate" and "late"
+    share "ate".
+    """
+    word = re.sub(r"[^a-z]", "", word.lower())
+    stem = word[:-1] if len(word) > 2 and word.endswith("e") and word[-2] not in "aeiouy" else word
+    matches = list(VOWEL_GROUPS.finditer(stem))
+    return word[matches[-1].start():] if matches else word
+
+
+class PoemIndex:
+    """Syllable and rhyme indexes over a CompiledChain, for constrained lines.
+
+    For a line with an exact cost budget (syllables, or words) and an optional
+    set of allowed final words, `_reach` computes for every state a bitmask of
+    the costs that can still be completed from it. The walk then only samples
+    successors that keep the line finishable, so there is no rejection loop.
+    The most recent REACH_CACHE_SIZE of those tables are kept.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.syllables = array('B', (min(255, count_syllables(model.vocab[w])) for w in range(len(model.vocab))))
+        self.rhymes = {}
+        self.rhyme_of = []
+        for word_id in range(len(model.vocab)):
+            key = rhyme_key(model.vocab[word_id])
+            self.rhyme_of.append(key)
+            self.rhymes.setdefault(key, set()).add(word_id)
+        self.rhymable = frozenset(
+            word_id for words in self.rhymes.values() if len(words) > 1 for word_id in words
+        )
+        self._cache = OrderedDict()
+        self._edges = None
+        self._spent = {}
+
+    def _edge_index(self):
+        """Source state of every edge, plus edges grouped by target state and by word."""
+        if self._edges is None:
+            m = self.model
+            source = array('I')
+            for state in range(len(m.offsets) - 1):
+                source.extend([state] * (m.offsets[state + 1] - m.offsets[state]))
+            self._edges = (source, _group_by(m.next_state, len(m.offsets) - 1),
+                           _group_by(m.successors, len(m.vocab)))
+        return self._edges
+
+    def _costs(self, by_syllables):
+        return self.syllables if by_syllables else array('B', [1]) * len(self.model.vocab)
+
+    def _start_costs(self, by_syllables):
+        """Cost of each start state's own words, in `start_states` order."""
+        if by_syllables not in self._spent:
+            m = self.model
+            costs = self._costs(by_syllables)
+            self._spent[by_syllables] = array('I', (
+                sum(costs[w] for w in m.state_words[state * m.order:(state + 1) * m.order])
+                for state in m.start_states
+            ))
+        return self._spent[by_syllables]
+
+    def _reach(self, budget, allowed, by_syllables):
+        """Per-state bitmask: bit b set if exactly b more cost can end the line.
+
+        A line ends on an edge into an allowed word, so only those edges seed
+        the table; costs then flow backwards along incoming edges, revisiting
+        a state only when it gains bits. States that can't reach an allowed
+        ending within the budget are never touched.
+        """
+        key = (budget, allowed, by_syllables)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        m = self.model
+        costs = self._costs(by_syllables)
+        source, (into_offsets, into), (word_offsets, word_edges) = self._edge_index()
+        mask = (1 << (budget + 1)) - 1
+        reach = [0] * (len(m.offsets) - 1)
+        if allowed is None:
+            final_edges = range(len(m.successors))
+        else:
+            final_edges = (edge for word in allowed
+                           for edge in word_edges[word_offsets[word]:word_offsets[word + 1]])
+        pending = set()
+        for edge in final_edges:
+            cost = costs[m.successors[edge]]
+            if cost <= budget:
+                reach[source[edge]] |= 1 << cost
+                pending.add(source[edge])
+        while pending:
+            state = pending.pop()
+            bits = reach[state]
+            for edge in into[into_offsets[state]:into_offsets[state + 1]]:
+                gained = (bits << costs[m.successors[edge]]) & mask & ~reach[source[edge]]
+                if gained:
+                    reach[source[edge]] |= gained
+                    pending.add(source[edge])
+
+        # Start states whose own words fit and leave a finishable remainder
+        starts = []
+        for state, spent in zip(m.start_states, self._start_costs(by_syllables)):
+            if spent < budget and reach[state] >> (budget - spent) & 1:
+                starts.append((state, spent))
+            elif spent == budget and (allowed is None or m.state_words[(state + 1) * m.order - 1] in allowed):
+                starts.append((state, spent))
+
+        self._cache[key] = reach, starts
+        if len(self._cache) > REACH_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return reach, starts
+
+    def line(self, budget, allowed=None, by_syllables=True, rng=random):
+        """Word IDs of a line costing exactly `budget`, ending in `allowed`, or None."""
+        m = self.model
+        costs = self._costs(by_syllables)
+        reach, starts = self._reach(budget, allowed, by_syllables)
+        if not starts:
+            return None
+
+        state, spent = rng.choice(starts)
+        output = list(m.state_words[state * m.order:(state + 1) * m.order])
+        remaining = budget - spent
+        while remaining > 0:
+            edges = []
+            weights = []
+            lo = m.offsets[state]
+            for edge in range(lo, m.offsets[state + 1]):
+                word = m.successors[edge]
+                cost = costs[word]
+                if cost == remaining and (allowed is None or word in allowed):
+                    pass
+                elif not (cost < remaining and reach[m.next_state[edge]] >> (remaining - cost) & 1):
+                    continue
+                edges.append(edge)
+                weights.append(m.cum_weights[edge] - (m.cum_weights[edge - 1] if edge > lo else 0))
+            edge = rng.choices(edges, weights)[0]
+            output.append(m.successors[edge])
+            remaining -= costs[m.successors[edge]]
+            state = m.next_state[edge]
+        return output
+
+    def poem(self, syllables=None, rhyme=None, lines=4, words_per_line=10, rng=random):
+        """Lines with exact syllable counts (or word counts) and a rhyme scheme like "AABB".
+
+        Constraints that the corpus can't satisfy are relaxed, rhyme first.
+        """
+        by_syllables = syllables is not None
+        budgets = syllables if by_syllables else [words_per_line] * (len(rhyme) if rhyme else lines)
+        if not self.model:
+            return '\n'.join('' for _ in budgets)  # Empty corpus: blank lines, like generate_line
+        rhyme = rhyme or "." * len(budgets)
+        endings = {}
+        output = []
+        for budget, letter in zip(budgets, rhyme):
+            if letter == ".":
+                allowed = None
+            elif letter in endings:
+                allowed = frozenset(self.rhymes[self.rhyme_of[endings[letter][0]]] - set(endings[letter]))
+            else:
+                allowed = self.rhymable
+
+            words = self.line(budget, allowed, by_syllables, rng)
+            if words is None:
+                words = self.line(budget, None, by_syllables, rng)
+            if words is None:
+                words = self.model.walk(words_per_line, rng)
+            if letter != ".":
+                endings.setdefault(letter, []).append(words[-1])
+            output.append(' '.join(self.model.vocab[w] for w in words))
+        return '\n'.join(output)
+
+
+def _group_by(values, groups):
+    """CSR grouping of positions by value: (offsets, positions), each group in order."""
+    offsets = array('I', [0]) * (groups + 1)
+    for value in values:
+        offsets[value + 1] += 1
+    for group in range(groups):
+        offsets[group + 1] += offsets[group]
+    positions = array('I', [0]) * len(values)
+    fill = offsets[:-1]
+    for position, value in enumerate(values):
+        positions[fill[value]] = position
+        fill[value] += 1
+    return offsets, positions
+
+
+_POEM_INDEXES = weakref.WeakKeyDictionary()
+
+
+def poem_index(model):
+    """The PoemIndex for a CompiledChain, built on first use."""
+    if model not in _POEM_INDEXES:
+        _POEM_INDEXES[model] = PoemIndex(model)
+    return _POEM_INDEXES[model]
+
+
+def generate_line(model, max_words=12, rng=random):
     """Generate a single line of poetry."""
-    if not chain:
+    if not model:
         return ""
-    key = random.choice(list(chain.keys()))
-    output = list(key)
-    for _ in range(max_words - len(key)):
-        if key in chain:
-            next_word = random.choice(chain[key])
-            output.append(next_word)
-            key = tuple(output[-len(key):])
-        else:
+    return ' '.join(model.vocab[word] for word in model.walk(max_words, rng))
+
+
+def generate_lines_batch(model, count, max_words=12, seed=None):
+    """Generate `count` lines from a CompiledChain in lock-step with NumPy.
+
+    Every line advances one word per step: the random numbers for all lines
+    are drawn at once and the alias tables are indexed as arrays. Returns
+    None if NumPy isn't installed.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+
+    rng = np.random.default_rng(seed)
+    order = model.order
+    offsets = np.frombuffer(model.offsets, dtype=np.uint32).astype(np.int64)
+    successors = np.frombuffer(model.successors, dtype=np.uint32)
+    next_state = np.frombuffer(model.next_state, dtype=np.uint32)
+    alias_prob = np.frombuffer(model.alias_prob, dtype=np.uint32)
+    alias = np.frombuffer(model.alias, dtype=np.uint32)
+    state_words = np.frombuffer(model.state_words, dtype=np.uint32).reshape(-1, order)
+    start_states = np.frombuffer(model.start_states, dtype=np.uint32)
+
+    states = start_states[rng.integers(len(start_states), size=count)]
+    words = np.zeros((count, max(order, max_words)), dtype=np.uint32)
+    words[:, :order] = state_words[states]
+    lengths = np.full(count, order)
+    alive = np.ones(count, dtype=bool)
+    last_edge = max(0, len(successors) - 1)
+    for step in range(order, max_words):
+        lo = offsets[states]
+        degree = offsets[states + 1] - lo
+        alive &= degree > 0
+        if not alive.any():
             break
-    return ' '.join(output)
+        bucket = np.minimum(lo + (rng.random(count) * degree).astype(np.int64), last_edge)
+        keep = rng.integers(0, 1 << 32, size=count, dtype=np.uint64) < alias_prob[bucket]
+        edge = np.where(keep, bucket, alias[bucket])
+        words[alive, step] = successors[edge[alive]]
+        states = np.where(alive, next_state[edge], states)
+        lengths += alive
+
+    vocab = model.vocab
+    return [' '.join(vocab[w] for w in row[:n].tolist()) for row, n in zip(words, lengths)]
 
 
-def generate_poem(chain, lines=4, words_per_line=10):
-    """Generate a complete poem."""
+def generate_poem(model, lines=4, words_per_line=10, rng=random, form=None):
+    """Generate a complete poem, optionally in one of the FORMS."""
+    if form is not None:
+        return poem_index(model).poem(**FORMS[form], words_per_line=words_per_line, rng=rng)
     poem_lines = []
     for _ in range(lines):
-        line = generate_line(chain, words_per_line)
+        line = generate_line(model, words_per_line, rng)
         poem_lines.append(line)
     return '\n'.join(poem_lines)
 
 
+def generate_poems(model, count, lines=4, words_per_line=10, seed=None, form=None):
+    """Generate `count` poems from one seeded RNG (same seed, same poems).
+
+    Plain poems from a CompiledChain are generated in lock-step with NumPy
+    when it's installed, so a given seed yields different poems with and
+    without NumPy.
+    """
+    if form is None and isinstance(model, CompiledChain) and model:
+        batch = generate_lines_batch(model, count * lines, words_per_line, seed)
+        if batch is not None:
+            return ['\n'.join(batch[i:i + lines]) for i in range(0, len(batch), lines)]
+
+    rng = random.Random(seed)
+    return [generate_poem(model, lines, words_per_line, rng, form) for _ in range(count)]
+
+
+def percentiles(values, quantiles=(0.50, 0.95, 0.99)):
+    """Nearest-rank percentiles of a list of numbers."""
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    return [ordered[round(q * last)] for q in quantiles]
+
+
+def benchmark(model, poems=10000, batch=100, lines=4, words_per_line=10, seed=0):
+    """Measure batch throughput in poems/sec and per-batch latency percentiles."""
+    latencies = []
+    start = time.perf_counter()
+    for i in range(0, poems, batch):
+        t = time.perf_counter()
+        generate_poems(model, min(batch, poems - i), lines, words_per_line, seed=seed + i)
+        latencies.append((time.perf_counter() - t) * 1000)
+    elapsed = time.perf_counter() - start
+
+    p50, p95, p99 = percentiles(latencies)
+    print(f"{poems} poems in {elapsed:.2f}s: {poems / elapsed:,.0f} poems/sec")
+    print(f"batch of {batch} latency: p50 {p50:.2f}ms  p95 {p95:.2f}ms  p99 {p99:.2f}ms")
+
+
+class PoemRequestHandler(BaseHTTPRequestHandler):
+    """Serve poems as JSON from the server's warm model.
+
+    GET /poems?count=3&seed=7 or POST /poems with a JSON body of the same
+    fields (count, lines, words_per_line, seed, form).
+    """
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        self.respond(url.path, dict(parse_qsl(url.query)))
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.send_json(400, {"error": "bad Content-Length"})
+            return
+        try:
+            params = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            params = None
+        if not isinstance(params, dict):
+            self.send_json(400, {"error": "body must be a JSON object"})
+            return
+        self.respond(urlsplit(self.path).path, params)
+
+    def respond(self, path, params):
+        if path != '/poems':
+            self.send_json(404, {"error": "try /poems"})
+            return
+        try:
+            count = int(params.get('count', 1))
+            lines = int(params.get('lines', 4))
+            words_per_line = int(params.get('words_per_line', 10))
+            seed = params.get('seed')
+            seed = None if seed is None else int(seed)
+        except (TypeError, ValueError):
+            self.send_json(400, {"error": "count, lines, words_per_line and seed must be integers"})
+            return
+        form = params.get('form')
+        if form is not None and (not isinstance(form, str) or form not in FORMS
+                                 or not isinstance(self.server.model, CompiledChain)):
+            self.send_json(400, {"error": f"form must be one of {', '.join(FORMS)} (not with --backoff)"})
+            return
+        if not 1 <= count <= MAX_BATCH:
+            self.send_json(400, {"error": f"count must be between 1 and {MAX_BATCH}"})
+            return
+        if not 1 <= lines <= MAX_LINES:
+            self.send_json(400, {"error": f"lines must be between 1 and {MAX_LINES}"})
+            return
+        if not 1 <= words_per_line <= MAX_WORDS_PER_LINE:
+            self.send_json(400, {"error": f"words_per_line must be between 1 and {MAX_WORDS_PER_LINE}"})
+            return
+        if count * lines * words_per_line > MAX_REQUEST_WORDS:
+            self.send_json(400, {"error": f"count * lines * words_per_line must be at most {MAX_REQUEST_WORDS}"})
+            return
+
+        poems = generate_poems(self.server.model, count, lines, words_per_line, seed, form)
+        self.send_json(200, {"poems": poems})
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(model, port=DEFAULT_PORT, host='127.0.0.1'):
+    """Answer poem requests over local HTTP, one thread per request."""
+    server = ThreadingHTTPServer((host, port), PoemRequestHandler)
+    server.model = model
+    print(f"Serving poems on http://{host}:{port}/poems (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
 def format_poem(poem, title=None):
     """Format poem with title and wrapping."""
     if title is None:
@@ -97,27 +1257,61 @@ def format_poem(poem, title=None):
     return formatted
 
 
-def main():
+def main(argv=None):
     """Generate and display bad poetry."""
-    print("\n🤖 BAD ROBOT POETRY GENERATOR 🤖")
-    print("Markov chains + mixed corpus = art(?)\n")
-
-    chain = build_chain(CORPUS, order=2)
-
-    titles = [
-        "Ode to a Preheated Void",
-        "The Raven's Recipe",
-        "Sonnet for a Mixing Bowl",
-        "Dreams at 350 Degrees",
-        "Nevermore (Serves 4)",
-        "To Bake or Not to Bake",
-        "Midnight in the Kitchen",
-        "The Buttered Soul",
-    ]
+    parser = argparse.ArgumentParser(description="Markov chains making weird poetry.")
+    parser.add_argument("--corpus", metavar="FILE", help="train on a text file instead of the built-in corpus")
+    parser.add_argument("--order", type=int, default=2, help="words of context per state (default: 2)")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes for building from --corpus")
+    parser.add_argument("--no-cache", action="store_true", help="always rebuild the model, skipping the cache")
+    parser.add_argument("--backoff", action="store_true",
+                        help="use a multi-order model that backs off to shorter contexts (not cached)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--batch", type=int, metavar="N", help="print N poems as JSON lines and exit")
+    mode.add_argument("--serve", type=int, nargs="?", const=DEFAULT_PORT, metavar="PORT",
+                      help=f"serve poems over local HTTP (default port {DEFAULT_PORT})")
+    mode.add_argument("--bench", type=int, nargs="?", const=10000, metavar="N",
+                      help="benchmark generating N poems (default 10000)")
+    parser.add_argument("--seed", type=int, help="RNG seed for --batch and --bench")
+    parser.add_argument("--form", choices=sorted(FORMS), help="constrain meter and rhyme")
+    args = parser.parse_args(argv)
+    if args.form and args.backoff:
+        parser.error("--form needs the compiled chain; it can't be combined with --backoff")
+    if args.order < 1:
+        parser.error("--order must be at least 1")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    interactive = args.batch is None and args.serve is None and args.bench is None
+    if interactive:
+        print("\n🤖 BAD ROBOT POETRY GENERATOR 🤖")
+        print("Markov chains + mixed corpus = art(?)\n")
+
+    if args.backoff:
+        model = build_backoff_model(args.corpus or [CORPUS], order=args.order)
+    elif not args.no_cache:
+        model = cached_model(order=args.order, path=args.corpus, jobs=args.jobs)
+    elif args.corpus and args.jobs > 1:
+        model = compile_table(build_table_parallel(args.corpus, order=args.order, processes=args.jobs))
+    elif args.corpus:
+        model = compile_chain(build_chain_stream(args.corpus, order=args.order))
+    else:
+        model = compile_chain(build_chain(CORPUS, order=args.order))
+
+    if args.batch is not None:
+        poems = generate_poems(model, args.batch, seed=args.seed, form=args.form)
+        sys.stdout.write(''.join(json.dumps({"poem": poem}) + '\n' for poem in poems))
+        return
+    if args.serve is not None:
+        serve(model, args.serve)
+        return
+    if args.bench is not None:
+        benchmark(model, poems=args.bench, seed=args.seed or 0)
+        return
 
     while True:
-        title = random.choice(titles)
-        poem = generate_poem(chain, lines=4, words_per_line=10)
+        title = random.choice(TITLES)
+        poem = generate_poem(model, lines=4, words_per_line=10, form=args.form)
         print(format_poem(poem, title))
 
         choice = input("\n[Enter] for more poetry, [q] to quit: ").strip().lower()
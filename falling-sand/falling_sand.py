@@ -10,23 +10,54 @@ Controls:
     - 3: Select Stone
     - 4: Select Fire
     - Mouse Wheel: Change brush size
+    - Arrow Keys: Pan the view
+    - +/-: Zoom in/out
     - C: Clear screen
     - Space: Pause/Resume
+    - T: Toggle turbo (simulate as fast as possible)
+    - P: Toggle profiler overlay
     - ESC: Quit
 """
 
+import argparse
+import csv
+import json
 import pygame
 import random
+import time
+from collections import deque
 from enum import Enum
+from functools import lru_cache
+from math import isqrt
 from dataclasses import dataclass
 
 # Constants
 WIDTH, HEIGHT = 800, 600
-CELL_SIZE = 4
-COLS = WIDTH // CELL_SIZE
-ROWS = HEIGHT // CELL_SIZE
+UI_HEIGHT = 50
+CELL_SIZE = 4  # Default zoom (pixels per cell)
 FPS = 60
 
+# Simulation timing (fixed timestep, decoupled from the render rate)
+SIM_HZ = 60
+SIM_STEP_MS = 1000 / SIM_HZ
+MAX_STEPS_PER_FRAME = 4  # Catch-up cap so a slow frame can't snowball
+
+# World size in cells, independent of the window
+WORLD_COLS = 400
+WORLD_ROWS = 300
+
+# Camera
+ZOOM_LEVELS = (1, 2, 4, 8, 16)
+PAN_SPEED = 16  # Pixels per frame while an arrow key is held
+
+# Brush
+BRUSH_FILL = 0.7  # Chance that an empty cell under the brush gets a particle
+
+# Profiler
+PROFILE_WINDOW = 240  # Frames kept for rolling percentiles
+PROFILE_REFRESH = 15  # Frames between overlay text updates
+PROFILE_HEIGHT = 20
+
 # Colors
 BACKGROUND = (20, 20, 30)
 UI_BG = (40, 40, 50)
@@ -87,35 +118,203 @@ def create_particle(ptype: ParticleType) -> Particle:
     )
 
 
+@lru_cache(maxsize=None)
+def brush_mask(radius: int) -> tuple:
+    """Circular brush as (row offset, half width) spans, one per brush row."""
+    return tuple((dr, isqrt(radius * radius - dr * dr)) for dr in range(-radius, radius + 1))
+
+
+def stroke_points(start: tuple, end: tuple, spacing: int) -> list:
+    """Brush centers from start to end (inclusive), at most `spacing` cells apart."""
+    (r0, c0), (r1, c1) = start, end
+    steps = max(abs(r1 - r0), abs(c1 - c0)) // spacing + 1
+    return [
+        (r0 + round((r1 - r0) * i / steps), c0 + round((c1 - c0) * i / steps))
+        for i in range(1, steps + 1)
+    ]
+
+
+class FrameProfiler:
+    """Per-frame section timings with rolling percentiles and an optional trace file."""
+
+    SECTIONS = ("events", "update", "render")
+
+    def __init__(self, trace_path: str = None, window: int = PROFILE_WINDOW):
+        self.visible = False
+        self.trace_path = trace_path
+        self.trace = []
+        self.samples = {name: deque(maxlen=window) for name in self.SECTIONS}
+        self.summary = ""
+        self.frame = 0
+        self._current = {}
+        self._last = 0.0
+
+    @property
+    def active(self) -> bool:
+        """Timing is only collected while the overlay is shown or a trace is recorded."""
+        return self.visible or self.trace_path is not None
+
+    def begin_frame(self):
+        """Start timing a new frame."""
+        self._current = {}
+        self._last = time.perf_counter()
+
+    def mark(self, section: str):
+        """Record the time since the previous mark under `section`, in milliseconds."""
+        now = time.perf_counter()
+        self._current[section] = (now - self._last) * 1000
+        self._last = now
+
+    def end_frame(self):
+        """Commit the current frame's timings."""
+        if not self.active:
+            return
+        for name in self.SECTIONS:
+            self.samples[name].append(self._current.get(name, 0.0))
+        if self.trace_path is not None:
+            row = {name: round(self._current.get(name, 0.0), 3) for name in self.SECTIONS}
+            self.trace.append({"frame": self.frame, **row})
+        self.frame += 1
+        if self.frame % PROFILE_REFRESH == 0:
+            self.summary = self.format_summary()
+
+    def percentiles(self, section: str) -> tuple:
+        """Rolling (p50, p95, p99) for a section, in milliseconds."""
+        values = sorted(self.samples[section])
+        if not values:
+            return (0.0, 0.0, 0.0)
+        last = len(values) - 1
+        return tuple(values[round(q * last)] for q in (0.50, 0.95, 0.99))
+
+    def format_summary(self) -> str:
+        """One-line p50/p95/p99 summary of every section."""
+        parts = []
+        for name in self.SECTIONS:
+            p50, p95, p99 = self.percentiles(name)
+            parts.append(f"{name} {p50:.1f}/{p95:.1f}/{p99:.1f}")
+        return "  ".join(parts) + "  ms (p50/p95/p99)"
+
+    def draw(self, screen, font, top: int):
+        """Draw the summary in a strip above the UI bar."""
+        if not self.visible:
+            return
+        pygame.draw.rect(screen, UI_BG, (0, top - PROFILE_HEIGHT, WIDTH, PROFILE_HEIGHT))
+        text = font.render(self.summary or "collecting...", True, WHITE)
+        screen.blit(text, (10, top - PROFILE_HEIGHT + 4))
+
+    def write_trace(self):
+        """Dump every recorded frame to the trace file (.json, anything else is CSV)."""
+        if self.trace_path is None:
+            return
+        with open(self.trace_path, "w", newline="") as f:
+            if self.trace_path.endswith(".json"):
+                json.dump(self.trace, f)
+            else:
+                writer = csv.DictWriter(f, fieldnames=["frame", *self.SECTIONS])
+                writer.writeheader()
+                writer.writerows(self.trace)
+        print(f"Wrote {len(self.trace)} frames to {self.trace_path}")
+
+
 class FallingSand:
-    def __init__(self):
+    def __init__(self, profile: bool = False, trace_path: str = None, turbo: bool = False,
+                 cols: int = WORLD_COLS, rows: int = WORLD_ROWS):
         pygame.init()
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT + 50))
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT + UI_HEIGHT))
         pygame.display.set_caption("Falling Sand Simulator")
         self.clock = pygame.time.Clock()
         self.font = pygame.font.Font(None, 24)
+        self.small_font = pygame.font.Font(None, 20)
+        self.profiler = FrameProfiler(trace_path)
+        self.profiler.visible = profile
+
+        # Grid, plus a particle count per row so empty rows cost nothing
+        self.rows = rows
+        self.cols = cols
+        self.grid = [[None for _ in range(cols)] for _ in range(rows)]
+        self.row_counts = [0] * rows
+        self.particle_count = 0
 
-        # Grid
-        self.grid = [[None for _ in range(COLS)] for _ in range(ROWS)]
+        # Camera (top-left world cell of the viewport and pixels per cell),
+        # starting centred over the floor where particles settle
+        self.cell_size = CELL_SIZE
+        self.cam_row = rows - self.view_size()[0]
+        self.cam_col = (cols - WIDTH // CELL_SIZE) // 2
+        self.clamp_camera()
 
         # State
         self.running = True
         self.paused = False
         self.selected_type = ParticleType.SAND
+        self.turbo = turbo
         self.brush_size = 3
-        self.particle_count = 0
+        self.last_brush_cell = None  # Previous stroke position while dragging
+
+        # Fixed-timestep scheduler
+        self.accumulator = 0.0
+        self.frame_start = 0.0
+        self.render_ms = 0.0
+        self.steps_counted = 0
+        self.rate_started = 0
+        self.sim_rate = 0
 
     def in_bounds(self, row: int, col: int) -> bool:
         """Check if coordinates are within grid bounds."""
-        return 0 <= row < ROWS and 0 <= col < COLS
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def view_size(self) -> tuple:
+        """Number of (rows, cols) visible in the viewport, rounded up."""
+        return (-(-HEIGHT // self.cell_size), -(-WIDTH // self.cell_size))
+
+    def clamp_camera(self):
+        """Keep the viewport inside the world."""
+        view_rows, view_cols = self.view_size()
+        self.cam_row = max(0, min(self.cam_row, self.rows - view_rows))
+        self.cam_col = max(0, min(self.cam_col, self.cols - view_cols))
+
+    def pan(self, dx: int, dy: int):
+        """Move the camera by a screen-space pixel offset."""
+        self.cam_col += round(dx / self.cell_size)
+        self.cam_row += round(dy / self.cell_size)
+        self.clamp_camera()
+
+    def zoom(self, step: int):
+        """Step through the zoom levels, keeping the viewport center fixed."""
+        index = ZOOM_LEVELS.index(self.cell_size)
+        index = max(0, min(len(ZOOM_LEVELS) - 1, index + step))
+        if ZOOM_LEVELS[index] == self.cell_size:
+            return
+
+        center_row, center_col = self.screen_to_cell((WIDTH // 2, HEIGHT // 2))
+        self.cell_size = ZOOM_LEVELS[index]
+        view_rows, view_cols = self.view_size()
+        self.cam_row = center_row - view_rows // 2
+        self.cam_col = center_col - view_cols // 2
+        self.clamp_camera()
+
+    def screen_to_cell(self, pos: tuple) -> tuple:
+        """Map a screen pixel position to a world (row, col) through the camera."""
+        x, y = pos
+        return (self.cam_row + y // self.cell_size, self.cam_col + x // self.cell_size)
 
     def is_empty(self, row: int, col: int) -> bool:
         """Check if a cell is empty."""
         return self.in_bounds(row, col) and self.grid[row][col] is None
 
     def swap(self, r1: int, c1: int, r2: int, c2: int):
-        """Swap two cells."""
-        self.grid[r1][c1], self.grid[r2][c2] = self.grid[r2][c2], self.grid[r1][c1]
+        """Swap two cells, moving a particle's row count along with it."""
+        first, second = self.grid[r1][c1], self.grid[r2][c2]
+        self.grid[r1][c1], self.grid[r2][c2] = second, first
+        if r1 != r2 and (first is None) != (second is None):
+            moved = 1 if second is None else -1
+            self.row_counts[r1] -= moved
+            self.row_counts[r2] += moved
+
+    def remove(self, row: int, col: int):
+        """Empty a cell that holds a particle."""
+        self.grid[row][col] = None
+        self.row_counts[row] -= 1
+        self.particle_count -= 1
 
     def update_sand(self, row: int, col: int):
         """Update sand particle physics."""
@@ -185,7 +384,7 @@ class FallingSand:
             if random.random() < 0.5:
                 self.grid[row][col] = create_particle(ParticleType.SMOKE)
             else:
-                self.grid[row][col] = None
+                self.remove(row, col)
             return
 
         # Fire flickers and rises
@@ -212,7 +411,7 @@ class FallingSand:
         # Decrease lifetime
         particle.lifetime -= 1
         if particle.lifetime <= 0:
-            self.grid[row][col] = None
+            self.remove(row, col)
             return
 
         # Fade color
@@ -234,16 +433,21 @@ class FallingSand:
         if self.paused:
             return
 
-        # Reset update flags
-        for row in range(ROWS):
-            for col in range(COLS):
-                if self.grid[row][col]:
-                    self.grid[row][col].updated = False
+        # Reset update flags, skipping empty rows by their count
+        row_counts = self.row_counts
+        for row, cells in enumerate(self.grid):
+            if row_counts[row]:
+                for particle in cells:
+                    if particle:
+                        particle.updated = False
 
         # Update bottom to top for falling particles
-        for row in range(ROWS - 1, -1, -1):
+        for row in range(self.rows - 1, -1, -1):
+            if not row_counts[row]:
+                continue
+
             # Randomly iterate left-to-right or right-to-left for natural flow
-            cols = list(range(COLS))
+            cols = list(range(self.cols))
             if random.random() < 0.5:
                 cols.reverse()
 
@@ -264,43 +468,103 @@ class FallingSand:
                     self.update_smoke(row, col)
                 # Stone doesn't move
 
-    def place_particles(self, mouse_pos: tuple, erase: bool = False):
-        """Place or erase particles at mouse position."""
-        mx, my = mouse_pos
+    def step_simulation(self):
+        """Run 0..N fixed physics steps for the time that passed since the last frame.
+
+        Normal mode catches up with whole steps (no interpolation) up to
+        MAX_STEPS_PER_FRAME and drops any backlog beyond that. Turbo mode steps
+        until the frame's time budget is spent, leaving room for one render.
+        """
+        if self.paused:
+            self.accumulator = 0.0
+            return
 
+        steps = 0
+        if self.turbo:
+            budget = (1000 / FPS - self.render_ms) / 1000
+            while True:
+                self.update_particles()
+                steps += 1
+                if time.perf_counter() - self.frame_start >= budget:
+                    break
+        else:
+            self.accumulator += self.clock.get_time()
+            while self.accumulator >= SIM_STEP_MS and steps < MAX_STEPS_PER_FRAME:
+                self.update_particles()
+                self.accumulator -= SIM_STEP_MS
+                steps += 1
+            if steps == MAX_STEPS_PER_FRAME:
+                self.accumulator = min(self.accumulator, SIM_STEP_MS)
+
+        # Measured physics steps per second, for the HUD
+        self.steps_counted += steps
+        now = pygame.time.get_ticks()
+        if now - self.rate_started >= 1000:
+            self.sim_rate = self.steps_counted * 1000 // max(1, now - self.rate_started)
+            self.steps_counted = 0
+            self.rate_started = now
+
+    def place_particles(self, mouse_pos: tuple, erase: bool = False):
+        """Place or erase particles along the stroke up to the mouse position."""
         # Only place in the grid area (not UI)
-        if my >= HEIGHT:
+        if mouse_pos[1] >= HEIGHT:
+            self.last_brush_cell = None
             return
 
-        col = mx // CELL_SIZE
-        row = my // CELL_SIZE
-
-        # Place in a brush-sized area
-        for dr in range(-self.brush_size, self.brush_size + 1):
-            for dc in range(-self.brush_size, self.brush_size + 1):
-                # Circular brush
-                if dr * dr + dc * dc <= self.brush_size * self.brush_size:
-                    r, c = row + dr, col + dc
-                    if self.in_bounds(r, c):
-                        if erase:
-                            self.grid[r][c] = None
-                        elif self.grid[r][c] is None:
-                            # Add some randomness to placement
-                            if random.random() < 0.7:
-                                self.grid[r][c] = create_particle(self.selected_type)
+        cell = self.screen_to_cell(mouse_pos)
+        if self.last_brush_cell is None:
+            points = [cell]
+        else:
+            # Interpolate from the previous frame so fast drags don't leave gaps
+            points = stroke_points(self.last_brush_cell, cell, max(1, self.brush_size // 2))
+        self.last_brush_cell = cell
+
+        # Union the brush stamps per row so overlapping stamps are written once
+        spans = {}
+        for row, col in points:
+            for dr, half in brush_mask(self.brush_size):
+                r = row + dr
+                if 0 <= r < self.rows:
+                    spans.setdefault(r, []).append((col - half, col + half + 1))
+
+        for r, row_spans in spans.items():
+            merged = []
+            for c0, c1 in sorted(row_spans):
+                if merged and c0 <= merged[-1][1]:
+                    merged[-1][1] = max(merged[-1][1], c1)
+                else:
+                    merged.append([c0, c1])
+
+            for c0, c1 in merged:
+                self.fill_span(r, max(0, c0), min(self.cols, c1), erase)
+
+    def fill_span(self, row: int, start: int, stop: int, erase: bool):
+        """Bulk write one row span: erase it, or randomly fill its empty cells."""
+        if start >= stop:
+            return
+        cells = self.grid[row]
+        before = cells[start:stop]
+        filled = stop - start - before.count(None)
+        if erase:
+            cells[start:stop] = [None] * (stop - start)
+            change = -filled
+        else:
+            ptype = self.selected_type
+            rand = random.random
+            after = [
+                create_particle(ptype) if particle is None and rand() < BRUSH_FILL else particle
+                for particle in before
+            ]
+            cells[start:stop] = after
+            change = stop - start - after.count(None) - filled
+        self.row_counts[row] += change
+        self.particle_count += change
 
     def clear_grid(self):
         """Clear all particles from the grid."""
-        self.grid = [[None for _ in range(COLS)] for _ in range(ROWS)]
-
-    def count_particles(self) -> int:
-        """Count total particles in the grid."""
-        count = 0
-        for row in range(ROWS):
-            for col in range(COLS):
-                if self.grid[row][col]:
-                    count += 1
-        return count
+        self.grid = [[None for _ in range(self.cols)] for _ in range(self.rows)]
+        self.row_counts = [0] * self.rows
+        self.particle_count = 0
 
     def handle_events(self):
         """Handle pygame events."""
@@ -323,36 +587,58 @@ class FallingSand:
                     self.clear_grid()
                 elif event.key == pygame.K_SPACE:
                     self.paused = not self.paused
+                elif event.key == pygame.K_t:
+                    self.turbo = not self.turbo
+                    self.accumulator = 0.0
+                elif event.key == pygame.K_p:
+                    self.profiler.visible = not self.profiler.visible
+                elif event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                    self.zoom(1)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    self.zoom(-1)
 
             elif event.type == pygame.MOUSEWHEEL:
                 self.brush_size = max(1, min(10, self.brush_size + event.y))
 
+        # Handle continuous panning
+        keys = pygame.key.get_pressed()
+        dx = (keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * PAN_SPEED
+        dy = (keys[pygame.K_DOWN] - keys[pygame.K_UP]) * PAN_SPEED
+        if dx or dy:
+            self.pan(dx, dy)
+
         # Handle continuous mouse input
         mouse_buttons = pygame.mouse.get_pressed()
         if mouse_buttons[0] or mouse_buttons[2]:
             mouse_pos = pygame.mouse.get_pos()
             self.place_particles(mouse_pos, erase=mouse_buttons[2])
+        else:
+            self.last_brush_cell = None
 
     def render(self):
         """Render the simulation."""
         # Clear screen
         self.screen.fill(BACKGROUND)
 
-        # Draw particles
-        for row in range(ROWS):
-            for col in range(COLS):
-                particle = self.grid[row][col]
+        # Draw particles, visiting only the cells inside the viewport
+        size = self.cell_size
+        view_rows, view_cols = self.view_size()
+        last_row = min(self.rows, self.cam_row + view_rows)
+        last_col = min(self.cols, self.cam_col + view_cols)
+
+        for row in range(self.cam_row, last_row):
+            if not self.row_counts[row]:
+                continue
+            cells = self.grid[row]
+            y = (row - self.cam_row) * size
+            for col in range(self.cam_col, last_col):
+                particle = cells[col]
                 if particle:
-                    rect = pygame.Rect(
-                        col * CELL_SIZE,
-                        row * CELL_SIZE,
-                        CELL_SIZE,
-                        CELL_SIZE
-                    )
+                    rect = pygame.Rect((col - self.cam_col) * size, y, size, size)
                     pygame.draw.rect(self.screen, particle.color, rect)
 
         # Draw UI bar
-        pygame.draw.rect(self.screen, UI_BG, (0, HEIGHT, WIDTH, 50))
+        pygame.draw.rect(self.screen, UI_BG, (0, HEIGHT, WIDTH, UI_HEIGHT))
 
         # Draw particle type buttons
         types = [
@@ -377,11 +663,21 @@ class FallingSand:
         brush_text = self.font.render(f"Brush: {self.brush_size}", True, WHITE)
         self.screen.blit(brush_text, (x_offset + 20, HEIGHT + 16))
 
-        # Draw particle count
-        self.particle_count = self.count_particles()
+        # Draw particle count (kept up to date as particles are added and removed)
         count_text = self.font.render(f"Particles: {self.particle_count}", True, WHITE)
         self.screen.blit(count_text, (x_offset + 120, HEIGHT + 16))
 
+        # Draw camera position and zoom
+        view_text = self.font.render(
+            f"View: {self.cam_col},{self.cam_row} @{self.cell_size}x", True, WHITE
+        )
+        self.screen.blit(view_text, (x_offset + 20, HEIGHT + 32))
+
+        # Draw simulation rate
+        sim_label = f"Sim: {self.sim_rate}/s" + (" TURBO" if self.turbo else "")
+        sim_text = self.font.render(sim_label, True, (255, 200, 100) if self.turbo else WHITE)
+        self.screen.blit(sim_text, (x_offset + 190, HEIGHT + 32))
+
         # Draw pause indicator
         if self.paused:
             pause_text = self.font.render("PAUSED", True, (255, 100, 100))
@@ -391,6 +687,8 @@ class FallingSand:
         fps_text = self.font.render(f"FPS: {int(self.clock.get_fps())}", True, WHITE)
         self.screen.blit(fps_text, (WIDTH - 80, HEIGHT + 32))
 
+        self.profiler.draw(self.screen, self.small_font, HEIGHT)
+
         pygame.display.flip()
 
     def run(self):
@@ -402,20 +700,47 @@ class FallingSand:
         print("  Right Click - Erase particles")
         print("  1/2/3/4     - Select Sand/Water/Stone/Fire")
         print("  Mouse Wheel - Change brush size")
+        print("  Arrow Keys  - Pan the view")
+        print("  +/-         - Zoom in/out")
         print("  C           - Clear screen")
         print("  Space       - Pause/Resume")
+        print("  T           - Toggle turbo")
+        print("  P           - Toggle profiler overlay")
         print("  ESC         - Quit")
         print("=" * 30)
 
         while self.running:
+            self.frame_start = time.perf_counter()
+            self.profiler.begin_frame()
             self.handle_events()
-            self.update_particles()
+            self.profiler.mark("events")
+            self.step_simulation()
+            self.profiler.mark("update")
+            render_start = time.perf_counter()
             self.render()
+            self.render_ms = (time.perf_counter() - render_start) * 1000
+            self.profiler.mark("render")
+            self.profiler.end_frame()
             self.clock.tick(FPS)
 
         pygame.quit()
+        self.profiler.write_trace()
 
 
 if __name__ == "__main__":
-    game = FallingSand()
+    parser = argparse.ArgumentParser(description="Falling Sand Simulator")
+    parser.add_argument("--profile", action="store_true", help="start with the profiler overlay shown")
+    parser.add_argument("--trace", metavar="FILE", help="write per-frame timings to a .csv or .json file")
+    parser.add_argument("--turbo", action="store_true", help="start in turbo mode")
+    parser.add_argument("--seed", type=int, help="seed the particle RNG for reproducible runs")
+    parser.add_argument("--cols", type=int, default=WORLD_COLS, help=f"world width in cells (default {WORLD_COLS})")
+    parser.add_argument("--rows", type=int, default=WORLD_ROWS, help=f"world height in cells (default {WORLD_ROWS})")
+    args = parser.parse_args()
+    if args.cols < 1 or args.rows < 1:
+        parser.error("--cols and --rows must be at least 1")
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    game = FallingSand(profile=args.profile, trace_path=args.trace, turbo=args.turbo,
+                       cols=args.cols, rows=args.rows)
     game.run()
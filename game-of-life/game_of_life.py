@@ -15,12 +15,18 @@ Controls:
     - C: Clear grid
     - +/-: Speed up/down
     - 1-5: Load preset patterns
+    - P: Toggle profiler overlay
     - ESC: Quit
 """
 
+import argparse
+import csv
+import json
 import pygame
 import numpy as np
 import random
+import time
+from collections import deque
 
 # Constants
 WIDTH, HEIGHT = 800, 600
@@ -39,6 +45,11 @@ UI_BG = (25, 25, 35)
 WHITE = (255, 255, 255)
 GRAY = (128, 128, 128)
 
+# Profiler
+PROFILE_WINDOW = 240  # Frames kept for rolling percentiles
+PROFILE_REFRESH = 15  # Frames between overlay text updates
+PROFILE_HEIGHT = 20
+
 
 # Preset patterns (relative coordinates)
 PATTERNS = {
@@ -59,13 +70,98 @@ PATTERNS = {
 }
 
 
+class FrameProfiler:
+    """Per-frame section timings with rolling percentiles and an optional trace file."""
+
+    SECTIONS = ("events", "update", "render")
+
+    def __init__(self, trace_path: str = None, window: int = PROFILE_WINDOW):
+        self.visible = False
+        self.trace_path = trace_path
+        self.trace = []
+        self.samples = {name: deque(maxlen=window) for name in self.SECTIONS}
+        self.summary = ""
+        self.frame = 0
+        self._current = {}
+        self._last = 0.0
+
+    @property
+    def active(self) -> bool:
+        """Timing is only collected while the overlay is shown or a trace is recorded."""
+        return self.visible or self.trace_path is not None
+
+    def begin_frame(self):
+        """Start timing a new frame."""
+        self._current = {}
+        self._last = time.perf_counter()
+
+    def mark(self, section: str):
+        """Record the time since the previous mark under `section`, in milliseconds."""
+        now = time.perf_counter()
+        self._current[section] = (now - self._last) * 1000
+        self._last = now
+
+    def end_frame(self):
+        """Commit the current frame's timings."""
+        if not self.active:
+            return
+        for name in self.SECTIONS:
+            self.samples[name].append(self._current.get(name, 0.0))
+        if self.trace_path is not None:
+            row = {name: round(self._current.get(name, 0.0), 3) for name in self.SECTIONS}
+            self.trace.append({"frame": self.frame, **row})
+        self.frame += 1
+        if self.frame % PROFILE_REFRESH == 0:
+            self.summary = self.format_summary()
+
+    def percentiles(self, section: str) -> tuple:
+        """Rolling (p50, p95, p99) for a section, in milliseconds."""
+        values = sorted(self.samples[section])
+        if not values:
+            return (0.0, 0.0, 0.0)
+        last = len(values) - 1
+        return tuple(values[round(q * last)] for q in (0.50, 0.95, 0.99))
+
+    def format_summary(self) -> str:
+        """One-line p50/p95/p99 summary of every section."""
+        parts = []
+        for name in self.SECTIONS:
+            p50, p95, p99 = self.percentiles(name)
+            parts.append(f"{name} {p50:.1f}/{p95:.1f}/{p99:.1f}")
+        return "  ".join(parts) + "  ms (p50/p95/p99)"
+
+    def draw(self, screen, font, top: int):
+        """Draw the summary in a strip above the UI bar."""
+        if not self.visible:
+            return
+        pygame.draw.rect(screen, UI_BG, (0, top - PROFILE_HEIGHT, WIDTH, PROFILE_HEIGHT))
+        text = font.render(self.summary or "collecting...", True, WHITE)
+        screen.blit(text, (10, top - PROFILE_HEIGHT + 4))
+
+    def write_trace(self):
+        """Dump every recorded frame to the trace file (.json, anything else is CSV)."""
+        if self.trace_path is None:
+            return
+        with open(self.trace_path, "w", newline="") as f:
+            if self.trace_path.endswith(".json"):
+                json.dump(self.trace, f)
+            else:
+                writer = csv.DictWriter(f, fieldnames=["frame", *self.SECTIONS])
+                writer.writeheader()
+                writer.writerows(self.trace)
+        print(f"Wrote {len(self.trace)} frames to {self.trace_path}")
+
+
 class GameOfLife:
-    def __init__(self):
+    def __init__(self, profile: bool = False, trace_path: str = None):
         pygame.init()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT + UI_HEIGHT))
         pygame.display.set_caption("Conway's Game of Life")
         self.clock = pygame.time.Clock()
         self.font = pygame.font.Font(None, 24)
+        self.small_font = pygame.font.Font(None, 20)
+        self.profiler = FrameProfiler(trace_path)
+        self.profiler.visible = profile
 
         # Grid
         self.grid = np.zeros((ROWS, COLS), dtype=np.uint8)
@@ -193,6 +289,8 @@ class GameOfLife:
                     self.clear()
                 elif event.key == pygame.K_g:
                     self.show_grid_lines = not self.show_grid_lines
+                elif event.key == pygame.K_p:
+                    self.profiler.visible = not self.profiler.visible
                 elif event.key == pygame.K_EQUALS or event.key == pygame.K_PLUS:
                     self.speed = min(60, self.speed + 2)
                 elif event.key == pygame.K_MINUS:
@@ -269,6 +367,8 @@ class GameOfLife:
         pop_text = self.font.render(f"Pop: {pop}", True, GRAY)
         self.screen.blit(pop_text, (WIDTH - 100, HEIGHT + 12))
 
+        self.profiler.draw(self.screen, self.small_font, HEIGHT)
+
         pygame.display.flip()
 
     def run(self):
@@ -289,18 +389,30 @@ class GameOfLife:
         print("    3: Pulsar")
         print("    4: Gosper Glider Gun")
         print("    5: Block (still life)")
+        print("  P           - Toggle profiler overlay")
         print("  ESC         - Quit")
         print("=" * 30)
 
         while self.running:
+            self.profiler.begin_frame()
             self.handle_events()
+            self.profiler.mark("events")
             self.update()
+            self.profiler.mark("update")
             self.render()
+            self.profiler.mark("render")
+            self.profiler.end_frame()
             self.clock.tick(FPS)
 
         pygame.quit()
+        self.profiler.write_trace()
 
 
 if __name__ == "__main__":
-    game = GameOfLife()
+    parser = argparse.ArgumentParser(description="Conway's Game of Life")
+    parser.add_argument("--profile", action="store_true", help="start with the profiler overlay shown")
+    parser.add_argument("--trace", metavar="FILE", help="write per-frame timings to a .csv or .json file")
+    args = parser.parse_args()
+
+    game = GameOfLife(profile=args.profile, trace_path=args.trace)
     game.run()
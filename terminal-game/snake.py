@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 """Terminal Snake Game - using curses"""
 
+import argparse
 import curses
 import random
 import time
+from collections import deque
 
 # Game settings
 INITIAL_SPEED = 0.1
@@ -11,6 +13,41 @@ SPEED_INCREMENT = 0.005
 MIN_SPEED = 0.03
 
 
+class Snake:
+    """The snake's body as a deque (head first) plus the set of cells it covers.
+
+    Moving touches only the two ends and collision checks are set lookups, so
+    a tick costs the same however long the snake gets.
+    """
+
+    def __init__(self, cells):
+        self.body = deque(cells)
+        self.cells = set(cells)
+
+    @property
+    def head(self):
+        return self.body[0]
+
+    def __len__(self):
+        return len(self.body)
+
+    def __iter__(self):
+        return iter(self.body)
+
+    def __contains__(self, cell):
+        return cell in self.cells
+
+    def move(self, new_head, grow=False):
+        """Step onto new_head. Returns the tail cell it left, or None when growing."""
+        self.body.appendleft(new_head)
+        self.cells.add(new_head)
+        if grow:
+            return None
+        tail = self.body.pop()
+        self.cells.discard(tail)
+        return tail
+
+
 def main(stdscr):
     # Setup curses
     curses.curs_set(0)  # Hide cursor
@@ -30,11 +67,11 @@ def main(stdscr):
     play_width = sw - 2
 
     # Initial snake position (center of screen)
-    snake = [
+    snake = Snake([
         (play_height // 2, play_width // 2),
         (play_height // 2, play_width // 2 - 1),
         (play_height // 2, play_width // 2 - 2),
-    ]
+    ])
 
     # Initial direction (right)
     direction = (0, 1)
@@ -47,45 +84,21 @@ def main(stdscr):
     speed = INITIAL_SPEED
     game_over = False
 
-    while not game_over:
-        # Draw border
-        stdscr.clear()
-        stdscr.attron(curses.color_pair(4))
-        stdscr.border()
-        stdscr.attroff(curses.color_pair(4))
-
-        # Draw score
-        score_text = f" Score: {score} | Speed: {int((INITIAL_SPEED - speed + MIN_SPEED) / SPEED_INCREMENT)} "
-        stdscr.attron(curses.color_pair(3))
-        stdscr.addstr(0, 2, score_text)
-        stdscr.attroff(curses.color_pair(3))
+    draw_frame(stdscr, snake, food, score, speed)
 
-        # Draw food
-        stdscr.attron(curses.color_pair(2))
-        stdscr.addch(food[0] + 1, food[1] + 1, '*')
-        stdscr.attroff(curses.color_pair(2))
-
-        # Draw snake
-        stdscr.attron(curses.color_pair(1))
-        for i, (y, x) in enumerate(snake):
-            char = '@' if i == 0 else 'o'
-            try:
-                stdscr.addch(y + 1, x + 1, char)
-            except curses.error:
-                pass
-        stdscr.attroff(curses.color_pair(1))
-
-        # Draw controls hint
-        hint = " [Arrow keys] Move | [Q] Quit "
-        stdscr.addstr(sh - 1, 2, hint)
-
-        stdscr.refresh()
+    while not game_over:
+        # Only the cells changed since the last tick go out to the terminal
+        stdscr.noutrefresh()
+        curses.doupdate()
 
         # Get input
         key = stdscr.getch()
 
         # Handle input
-        if key == ord('q') or key == ord('Q'):
+        if key == curses.KEY_RESIZE:
+            draw_frame(stdscr, snake, food, score, speed)
+            continue
+        elif key == ord('q') or key == ord('Q'):
             break
         elif key == curses.KEY_UP and direction != (1, 0):
             direction = (-1, 0)
@@ -97,7 +110,7 @@ def main(stdscr):
             direction = (0, 1)
 
         # Calculate new head position
-        new_head = (snake[0][0] + direction[0], snake[0][1] + direction[1])
+        new_head = (snake.head[0] + direction[0], snake.head[1] + direction[1])
 
         # Check wall collision
         if (new_head[0] < 0 or new_head[0] >= play_height or
@@ -105,22 +118,26 @@ def main(stdscr):
             game_over = True
             continue
 
-        # Check self collision
+        # Check self collision (the tail hasn't moved out of the way yet)
         if new_head in snake:
             game_over = True
             continue
 
-        # Move snake
-        snake.insert(0, new_head)
+        # Move snake, growing if it reached the food
+        ate = new_head == food
+        put_cell(stdscr, snake.head, 'o', curses.color_pair(1))
+        tail = snake.move(new_head, grow=ate)
+        put_cell(stdscr, new_head, '@', curses.color_pair(1))
 
-        # Check food collision
-        if new_head == food:
+        if ate:
             score += 10
             food = place_food(snake, play_height, play_width)
+            put_cell(stdscr, food, '*', curses.color_pair(2))
             # Speed up
             speed = max(MIN_SPEED, speed - SPEED_INCREMENT)
+            draw_score(stdscr, score, speed)
         else:
-            snake.pop()
+            put_cell(stdscr, tail, ' ')
 
         time.sleep(speed)
 
@@ -128,6 +145,45 @@ def main(stdscr):
     show_game_over(stdscr, score)
 
 
+def put_cell(stdscr, cell, char, attr=0):
+    """Draw one play-area cell; cells outside a shrunken window are skipped."""
+    try:
+        stdscr.addch(cell[0] + 1, cell[1] + 1, char, attr)
+    except curses.error:
+        pass
+
+
+def draw_score(stdscr, score, speed):
+    score_text = f" Score: {score} | Speed: {int((INITIAL_SPEED - speed + MIN_SPEED) / SPEED_INCREMENT)} "
+    try:
+        stdscr.addstr(0, 2, score_text, curses.color_pair(3))
+    except curses.error:
+        pass
+
+
+def draw_frame(stdscr, snake, food, score, speed):
+    """Redraw the whole screen; only needed at the start and after a resize."""
+    sh, sw = stdscr.getmaxyx()
+    stdscr.clear()
+
+    # Draw border
+    stdscr.attron(curses.color_pair(4))
+    stdscr.border()
+    stdscr.attroff(curses.color_pair(4))
+
+    draw_score(stdscr, score, speed)
+    put_cell(stdscr, food, '*', curses.color_pair(2))
+    for i, cell in enumerate(snake):
+        put_cell(stdscr, cell, '@' if i == 0 else 'o', curses.color_pair(1))
+
+    # Draw controls hint
+    hint = " [Arrow keys] Move | [Q] Quit "
+    try:
+        stdscr.addstr(sh - 1, 2, hint)
+    except curses.error:
+        pass
+
+
 def place_food(snake, height, width):
     """Place food in a random empty position."""
     while True:
@@ -167,9 +223,52 @@ def show_game_over(stdscr, score):
     stdscr.getch()
 
 
+def benchmark(lengths=(10, 100, 1000, 5000, 20000), ticks=20000, width=500):
+    """Time the per-tick game logic (collision checks and the move) by snake length.
+
+    The snake winds back and forth across a large board so it never hits
+    itself. The old list body, with its linear `in` and insert(0), is timed
+    alongside for comparison.
+    """
+    height = (max(lengths) + ticks) // width + 1
+
+    def cell(i):
+        row, col = divmod(i, width)
+        return (row, col if row % 2 == 0 else width - 1 - col)
+
+    path = [cell(i) for i in range(width * height)]
+    food = (-1, -1)  # Never reached, so the length stays fixed
+
+    print(f"{'length':>8} {'deque+set':>12} {'list':>12}   (per tick)")
+    for length in lengths:
+        results = []
+        for make in (Snake, list):
+            snake = make(path[length - 1::-1])
+            list_ticks = min(ticks, 2000) if make is list else ticks  # Lists get slow
+            start = time.perf_counter()
+            for k in range(length, length + list_ticks):
+                new_head = path[k]
+                if (new_head[0] < 0 or new_head[0] >= height or
+                        new_head[1] < 0 or new_head[1] >= width or new_head in snake):
+                    raise RuntimeError("benchmark snake collided")
+                if make is list:
+                    snake.insert(0, new_head)
+                    if new_head != food:
+                        snake.pop()
+                else:
+                    snake.move(new_head, grow=new_head == food)
+            results.append((time.perf_counter() - start) / list_ticks * 1e6)
+        print(f"{length:>8} {results[0]:>10.2f}us {results[1]:>10.2f}us")
+
+
 if __name__ == "__main__":
-    print("Starting Snake...")
-    print("Use arrow keys to move, Q to quit")
-    time.sleep(1)
-    curses.wrapper(main)
-    print("Thanks for playing!")
+    parser = argparse.ArgumentParser(description="Classic Snake in your terminal.")
+    parser.add_argument("--bench", action="store_true", help="time the game logic at growing snake lengths and exit")
+    if parser.parse_args().bench:
+        benchmark()
+    else:
+        print("Starting Snake...")
+        print("Use arrow keys to move, Q to quit")
+        time.sleep(1)
+        curses.wrapper(main)
+        print("Thanks for playing!")
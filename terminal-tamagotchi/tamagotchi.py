@@ -10,23 +10,63 @@ Usage:
     python tamagotchi.py play     # Play with your pet
     python tamagotchi.py sleep    # Put your pet to sleep
     python tamagotchi.py reset    # Start over with a new pet
+
+Many pets (SQLite store):
+    python tamagotchi.py --db pets.db --pet Fluffy feed
+    python tamagotchi.py --db pets.db list
+    python tamagotchi.py --db pets.db tick   # Apply decay to every pet
+
+Daemon (keeps pets in memory; the commands above are forwarded to it):
+    python tamagotchi.py daemon &
+
+Balance tuning (needs NumPy):
+    python tamagotchi.py simulate --pets 1000000 --days 30 --policy casual
 """
 
-import json
 import os
 import sys
 import time
+
+# Fast path for shell prompt hooks: a plain `status` prints the cached screen
+# (see write_status_cache) before anything else is imported or parsed
+if __name__ == "__main__" and sys.argv[1:] == ["status"] and not os.environ.get("TAMAGOTCHI_DB"):
+    try:
+        with open(os.path.expanduser("~/.tamagotchi.status"), encoding="utf-8") as f:
+            if time.time() < float(f.readline()):
+                sys.stdout.write(f.read())
+                sys.exit(0)
+    except (OSError, ValueError):
+        pass  # No cache or expired; fall through to the full status
+
+import getpass
+import json
+import math
 import random
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 
 # Save file location
 SAVE_FILE = Path.home() / ".tamagotchi.json"
+JOURNAL_FILE = Path.home() / ".tamagotchi.journal"
+COMPACT_BYTES = 64 * 1024  # Fold the journal into the save file past this size
+STATUS_CACHE = Path.home() / ".tamagotchi.status"  # Rendered status; read by the fast path above
+
+# Multi-pet database (used instead of SAVE_FILE when set)
+DB_ENV_VAR = "TAMAGOTCHI_DB"
+
+# Daemon socket; commands are forwarded here when a daemon is listening
+SOCKET_PATH = Path.home() / ".tamagotchi.sock"
+DAEMON_COMMANDS = ("status", "feed", "play", "sleep", "wake", "reset")
+FLUSH_SECONDS = 5.0  # How often the daemon writes changed pets to the store
+WHEEL_SLOTS = 4096
+WHEEL_TICK = 1.0     # Seconds per timer wheel slot
+HUNGRY_AT = 70       # Hunger level where the daemon reports a hungry pet
 
 # Time decay rates (per hour)
 HUNGER_RATE = 5      # Hunger increases by 5 per hour
 HAPPINESS_RATE = 3   # Happiness decreases by 3 per hour
 ENERGY_RATE = 2      # Energy decreases by 2 per hour
+SLEEP_RATE = 10      # Energy restores by 10 per hour while sleeping
 
 # ASCII Art
 SPRITES = {
@@ -67,12 +107,19 @@ SPRITES = {
 """,
 }
 
+# Population simulator: chance an owner checks in at each check interval
+CARE_POLICIES = {
+    "attentive": 1.0,
+    "casual": 0.35,
+    "neglectful": 0.05,
+}
+
 # Status bar characters
 BAR_FULL = "█"
 BAR_EMPTY = "░"
 
 
-def create_pet(name: str = None) -> dict:
+def create_pet(name: str = None, owner: str = None) -> dict:
     """Create a new pet."""
     if name is None:
         names = ["Pixel", "Byte", "Chip", "Bit", "Widget", "Nano", "Gizmo", "Spark"]
@@ -80,6 +127,7 @@ def create_pet(name: str = None) -> dict:
 
     return {
         "name": name,
+        "owner": owner or getpass.getuser(),
         "hunger": 50,
         "happiness": 50,
         "energy": 50,
@@ -91,51 +139,315 @@ def create_pet(name: str = None) -> dict:
     }
 
 
-def load_pet() -> dict:
-    """Load pet from file, applying time decay."""
-    if not SAVE_FILE.exists():
-        return None
+def atomic_write(path: Path, text: str):
+    """Write a file so readers see either the old or the new contents, never half."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_saved_pet() -> dict:
+    """Latest saved state: the last intact journal entry, else the save file."""
+    pet = None
+    if SAVE_FILE.exists():
+        with open(SAVE_FILE, "r") as f:
+            pet = json.load(f)
+
+    if JOURNAL_FILE.exists():
+        with open(JOURNAL_FILE, "r") as f:
+            for line in f:
+                try:
+                    pet = json.loads(line)["pet"]
+                except (ValueError, KeyError):
+                    continue  # Torn write from a crash; earlier entries still count
+
+    return pet
+
+
+def compact_journal(pet: dict):
+    """Fold the journal into the save file and start a fresh journal."""
+    atomic_write(SAVE_FILE, json.dumps(pet, indent=2))
+    if JOURNAL_FILE.exists():
+        JOURNAL_FILE.unlink()
 
-    with open(SAVE_FILE, "r") as f:
-        pet = json.load(f)
 
+def append_journal(pet: dict, action: str):
+    """Append the pet's new state to the journal as one fsync'd line.
+
+    A crash can only lose the entry being written. The journal is compacted
+    into the save file once it grows past COMPACT_BYTES.
+    """
+    entry = json.dumps({"action": action, "pet": pet}) + "\n"
+    with open(JOURNAL_FILE, "a+b") as f:
+        # Start on a fresh line if a previous write was torn
+        if f.seek(0, os.SEEK_END):
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                entry = "\n" + entry
+        f.write(entry.encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+        size = f.tell()
+
+    if size >= COMPACT_BYTES:
+        compact_journal(pet)
+
+
+def status_expiry(pet: dict) -> float:
+    """When render_status(pet) would first look different, as a Unix timestamp.
+
+    The screen shows stats as whole numbers and age to 0.1 days, and every
+    mood and sprite threshold is a whole number too, so the screen stays the
+    same until a stat crosses an integer, the age crosses a rounding boundary,
+    or the next wake-up or death.
+    """
     if not pet["is_alive"]:
+        return math.inf
+    age_boundary = (math.floor(pet["age"] * 10 + 0.5) + 0.5) / 10
+    fullness = 100 - pet["hunger"]
+    hours = [(age_boundary - pet["age"]) * 24, (fullness - math.floor(fullness)) / HUNGER_RATE]
+    wake, death = decay_times(pet)
+    if pet["is_sleeping"]:
+        hours += [wake, (math.floor(pet["energy"]) + 1 - pet["energy"]) / SLEEP_RATE]
+    else:
+        hours.append((pet["happiness"] - math.floor(pet["happiness"])) / HAPPINESS_RATE)
+        if pet["energy"] >= 1:  # Below that it only drains to 0, which still shows as 0
+            hours.append((pet["energy"] - math.floor(pet["energy"])) / ENERGY_RATE)
+    hours.append(death)
+    return datetime.fromisoformat(pet["last_seen"]).timestamp() + min(hours) * 3600
+
+
+def write_status_cache(pet: dict, text: str):
+    """Cache the rendered status screen until status_expiry(pet)."""
+    tmp = STATUS_CACHE.with_name(STATUS_CACHE.name + ".tmp")
+    tmp.write_text(f"{status_expiry(pet)}\n{text}\n", encoding="utf-8")
+    os.replace(tmp, STATUS_CACHE)  # No fsync: losing the cache only costs a slow status
+
+
+def invalidate_status_cache():
+    STATUS_CACHE.unlink(missing_ok=True)
+
+
+class JsonStore:
+    """The original single-pet layout: SAVE_FILE plus its journal."""
+
+    def load(self, owner: str = None, name: str = None) -> dict:
+        pet = read_saved_pet()
+        if pet is not None:
+            pet.setdefault("owner", getpass.getuser())
         return pet
 
-    # Calculate time since last interaction
-    last_seen = datetime.fromisoformat(pet["last_seen"])
-    now = datetime.now()
-    hours_passed = (now - last_seen).total_seconds() / 3600
+    def save(self, pet: dict, action: str = "save"):
+        invalidate_status_cache()
+        append_journal(pet, action)
+
+    def save_many(self, pets: list):
+        invalidate_status_cache()
+        for pet in pets:
+            append_journal(pet, "save")
+
+    def reset(self, pet: dict):
+        invalidate_status_cache()
+        compact_journal(pet)
+
+    def list_pets(self, owner: str = None) -> list:
+        pet = self.load()
+        return [pet] if pet and (owner is None or pet["owner"] == owner) else []
 
-    # Apply time decay
-    if hours_passed > 0.1:  # At least 6 minutes
-        pet["hunger"] = min(100, pet["hunger"] + int(hours_passed * HUNGER_RATE))
 
-        if not pet["is_sleeping"]:
-            pet["happiness"] = max(0, pet["happiness"] - int(hours_passed * HAPPINESS_RATE))
-            pet["energy"] = max(0, pet["energy"] - int(hours_passed * ENERGY_RATE))
+class SqliteStore:
+    """Many pets in one SQLite database, keyed by (owner, name).
+
+    Uses WAL mode so status reads don't block writers, and applies time decay
+    to every pet with a single UPDATE in `decay_all`.
+    """
+
+    FIELDS = ("owner", "name", "hunger", "happiness", "energy", "age",
+              "is_sleeping", "is_alive", "created_at", "last_seen")
+
+    def __init__(self, path):
+        import sqlite3
+
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS pets (
+                owner TEXT NOT NULL,
+                name TEXT NOT NULL,
+                hunger REAL NOT NULL,
+                happiness REAL NOT NULL,
+                energy REAL NOT NULL,
+                age REAL NOT NULL,
+                is_sleeping INTEGER NOT NULL,
+                is_alive INTEGER NOT NULL,
+                created_at TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                PRIMARY KEY (owner, name)
+            );
+            CREATE INDEX IF NOT EXISTS pets_by_name ON pets (name);
+            CREATE INDEX IF NOT EXISTS pets_alive ON pets (is_alive);
+        """)
+
+    def _to_pet(self, row) -> dict:
+        pet = dict(row)
+        pet["is_sleeping"] = bool(pet["is_sleeping"])
+        pet["is_alive"] = bool(pet["is_alive"])
+        return pet
+
+    def load(self, owner: str, name: str = None) -> dict:
+        """Load a pet by owner and name; the name may be omitted if the owner has one pet."""
+        if name is None:
+            rows = self.db.execute("SELECT * FROM pets WHERE owner = ? LIMIT 2", (owner,)).fetchall()
+            if len(rows) > 1:
+                raise LookupError(f"{owner} has several pets; pick one with --pet")
+            row = rows[0] if rows else None
         else:
-            # Sleeping restores energy slowly
-            pet["energy"] = min(100, pet["energy"] + int(hours_passed * 10))
-            pet["is_sleeping"] = pet["energy"] < 100
+            row = self.db.execute(
+                "SELECT * FROM pets WHERE owner = ? AND name = ?", (owner, name)
+            ).fetchone()
+        return self._to_pet(row) if row else None
+
+    def save_many(self, pets: list):
+        """Upsert many pets in one transaction."""
+        placeholders = ", ".join("?" for _ in self.FIELDS)
+        with self.db:
+            self.db.executemany(
+                f"INSERT OR REPLACE INTO pets ({', '.join(self.FIELDS)}) VALUES ({placeholders})",
+                [tuple(pet[field] for field in self.FIELDS) for pet in pets],
+            )
+
+    def save(self, pet: dict, action: str = "save"):
+        self.save_many([pet])
+
+    def reset(self, pet: dict):
+        self.save_many([pet])
+
+    def list_pets(self, owner: str = None) -> list:
+        if owner is None:
+            rows = self.db.execute("SELECT * FROM pets ORDER BY owner, name")
+        else:
+            rows = self.db.execute("SELECT * FROM pets WHERE owner = ? ORDER BY name", (owner,))
+        return [self._to_pet(row) for row in rows]
+
+    def decay_all(self, now: datetime = None) -> int:
+        """Bring every living pet up to `now` in SQL, with the same closed form as apply_decay."""
+        now = (now or datetime.now()).isoformat()
+        before = self.db.total_changes
+        with self.db:
+            self.db.execute(f"""
+                WITH base AS (
+                    SELECT rowid AS id,
+                        MAX(0, (julianday(:now) - julianday(last_seen)) * 24) AS elapsed,
+                        CASE WHEN is_sleeping THEN MAX(0, 100.0 - energy) / {SLEEP_RATE} ELSE 0 END AS wake,
+                        hunger, happiness
+                    FROM pets WHERE is_alive
+                ),
+                timeline AS (
+                    SELECT id, elapsed, wake,
+                        MAX(0, MIN((100.0 - hunger) / {HUNGER_RATE},
+                                   wake + happiness * 1.0 / {HAPPINESS_RATE})) AS death
+                    FROM base
+                ),
+                span AS (
+                    SELECT id, elapsed, wake, death, MIN(elapsed, death) AS hours,
+                        MAX(0, MIN(elapsed, death) - wake) AS awake
+                    FROM timeline
+                )
+                UPDATE pets SET
+                    hunger = MIN(100, hunger + span.hours * {HUNGER_RATE}),
+                    happiness = MAX(0, happiness - span.awake * {HAPPINESS_RATE}),
+                    energy = CASE
+                        WHEN is_sleeping AND span.hours < span.wake THEN energy + span.hours * {SLEEP_RATE}
+                        ELSE MAX(0, (CASE WHEN is_sleeping THEN 100 ELSE energy END)
+                                    - span.awake * {ENERGY_RATE})
+                    END,
+                    is_sleeping = is_sleeping AND span.hours < span.wake,
+                    age = age + span.hours / 24,
+                    is_alive = span.elapsed < span.death,
+                    last_seen = :now
+                FROM span WHERE pets.rowid = span.id
+            """, {"now": now})
+        return self.db.total_changes - before
+
+
+# Active store; main() swaps in a SqliteStore when a database is given
+store = JsonStore()
+
+
+def decay_times(pet: dict) -> tuple:
+    """Hours from `last_seen` until the pet wakes up and until it dies if left alone.
+
+    Stats change linearly between these events: hunger rises the whole time,
+    sleep restores energy until it reaches 100, and happiness and energy
+    only drain while awake. Death comes when hunger hits 100 or happiness
+    hits 0.
+    """
+    wake = max(0, 100 - pet["energy"]) / SLEEP_RATE if pet["is_sleeping"] else 0
+    death = min((100 - pet["hunger"]) / HUNGER_RATE, wake + pet["happiness"] / HAPPINESS_RATE)
+    return wake, max(0, death)
+
 
-        # Age increases
-        pet["age"] += hours_passed / 24  # Age in days
+def apply_decay(pet: dict, now: datetime) -> dict:
+    """Evaluate the pet's state at `now` in closed form, in memory.
 
-        # Check for death
-        if pet["hunger"] >= 100 or pet["happiness"] <= 0:
-            pet["is_alive"] = False
+    Any timestamp can be evaluated directly from the last saved state, and
+    evaluating in several steps gives the same result as one big step, so
+    frequent checks lose nothing.
+    """
+    if not pet["is_alive"]:
+        return pet
+
+    elapsed = max(0, (now - datetime.fromisoformat(pet["last_seen"])).total_seconds() / 3600)
+    wake, death = decay_times(pet)
+    hours = min(elapsed, death)  # Stats freeze at the moment of death
+    awake = max(0, hours - wake)
 
+    pet["hunger"] = min(100, pet["hunger"] + hours * HUNGER_RATE)
+    pet["happiness"] = max(0, pet["happiness"] - awake * HAPPINESS_RATE)
+    if pet["is_sleeping"] and hours < wake:
+        pet["energy"] = pet["energy"] + hours * SLEEP_RATE
+    else:
+        start = 100 if pet["is_sleeping"] else pet["energy"]
+        pet["energy"] = max(0, start - awake * ENERGY_RATE)
+        pet["is_sleeping"] = False
+    pet["age"] += hours / 24  # Age in days
+    pet["is_alive"] = elapsed < death
     pet["last_seen"] = now.isoformat()
-    save_pet(pet)
     return pet
 
 
-def save_pet(pet: dict):
-    """Save pet to file."""
+def next_event(pet: dict) -> tuple:
+    """The next scheduled change for a pet left alone: ("wake" or "death", when)."""
+    if not pet["is_alive"]:
+        return None
+    wake, death = decay_times(pet)
+    last_seen = datetime.fromisoformat(pet["last_seen"])
+    if pet["is_sleeping"] and wake < death:
+        return "wake", last_seen + timedelta(hours=wake)
+    return "death", last_seen + timedelta(hours=death)
+
+
+def load_pet(owner: str = None, name: str = None) -> dict:
+    """Load a pet from the store, applying time decay.
+
+    Decay is derived from `last_seen`, so it's applied in memory only and
+    loading never writes.
+    """
+    pet = store.load(owner or getpass.getuser(), name)
+    if pet is None:
+        return None
+    return apply_decay(pet, datetime.now())
+
+
+def save_pet(pet: dict, action: str = "save"):
+    """Save pet to the store, recording which action changed it."""
     pet["last_seen"] = datetime.now().isoformat()
-    with open(SAVE_FILE, "w") as f:
-        json.dump(pet, f, indent=2)
+    store.save(pet, action)
 
 
 def get_sprite(pet: dict) -> str:
@@ -184,23 +496,33 @@ def stat_bar(value: int, width: int = 10) -> str:
     return BAR_FULL * filled + BAR_EMPTY * (width - filled)
 
 
-def display_status(pet: dict):
-    """Display pet status."""
-    print("\n" + "=" * 35)
-    print(f"  {pet['name']}")
-    print("=" * 35)
-    print(get_sprite(pet))
+def render_status(pet: dict) -> str:
+    """Render the pet status screen."""
+    lines = ["\n" + "=" * 35, f"  {pet['name']}", "=" * 35, get_sprite(pet)]
 
-    print(f"  Mood: {get_mood(pet)}")
-    print(f"  Age:  {pet['age']:.1f} days")
-    print()
+    lines.append(f"  Mood: {get_mood(pet)}")
+    lines.append(f"  Age:  {pet['age']:.1f} days")
+    event = next_event(pet)
+    if event:
+        kind, when = event
+        outlook = "wakes up" if kind == "wake" else "needs care by"
+        lines.append(f"  Next: {outlook} {when:%a %H:%M}")
+    lines.append("")
 
     # Invert hunger for display (low hunger = good)
-    fullness = 100 - pet["hunger"]
-    print(f"  Fullness:   [{stat_bar(fullness)}] {fullness}%")
-    print(f"  Happiness:  [{stat_bar(pet['happiness'])}] {pet['happiness']}%")
-    print(f"  Energy:     [{stat_bar(pet['energy'])}] {pet['energy']}%")
-    print("=" * 35)
+    fullness = int(100 - pet["hunger"])
+    happiness = int(pet["happiness"])
+    energy = int(pet["energy"])
+    lines.append(f"  Fullness:   [{stat_bar(fullness)}] {fullness}%")
+    lines.append(f"  Happiness:  [{stat_bar(happiness)}] {happiness}%")
+    lines.append(f"  Energy:     [{stat_bar(energy)}] {energy}%")
+    lines.append("=" * 35)
+    return "\n".join(lines)
+
+
+def display_status(pet: dict):
+    """Display pet status."""
+    print(render_status(pet))
 
 
 def feed(pet: dict) -> str:
@@ -214,7 +536,7 @@ def feed(pet: dict) -> str:
 
     pet["hunger"] = max(0, pet["hunger"] - 30)
     pet["happiness"] = min(100, pet["happiness"] + 5)
-    save_pet(pet)
+    save_pet(pet, "feed")
     return f"*munch munch* {pet['name']} enjoyed the food! 🍖"
 
 
@@ -232,7 +554,7 @@ def play(pet: dict) -> str:
     pet["happiness"] = min(100, pet["happiness"] + 20)
     pet["energy"] = max(0, pet["energy"] - 15)
     pet["hunger"] = min(100, pet["hunger"] + 5)
-    save_pet(pet)
+    save_pet(pet, "play")
 
     actions = [
         f"{pet['name']} chased their tail! 🌀",
@@ -253,7 +575,7 @@ def sleep(pet: dict) -> str:
         return f"{pet['name']} isn't tired yet!"
 
     pet["is_sleeping"] = True
-    save_pet(pet)
+    save_pet(pet, "sleep")
     return f"{pet['name']} curled up and went to sleep... 💤"
 
 
@@ -265,12 +587,365 @@ def wake(pet: dict) -> str:
         return f"{pet['name']} is already awake!"
 
     pet["is_sleeping"] = False
-    save_pet(pet)
+    save_pet(pet, "wake")
     return f"{pet['name']} woke up and stretched! 🌅"
 
 
-def interactive_mode(pet: dict):
-    """Run interactive REPL mode."""
+ACTIONS = {"feed": feed, "play": play, "sleep": sleep, "wake": wake}
+
+
+def run_command(pet: dict, command: str) -> str:
+    """Run a one-shot command on a loaded pet and return what to print."""
+    if command in ACTIONS:
+        return ACTIONS[command](pet) + "\n" + render_status(pet)
+    return render_status(pet)
+
+
+def next_transition(pet: dict) -> tuple:
+    """Like next_event, but also reports when the pet gets hungry."""
+    event = next_event(pet)
+    if event and pet["hunger"] < HUNGRY_AT:
+        hungry = datetime.fromisoformat(pet["last_seen"]) + timedelta(
+            hours=(HUNGRY_AT - pet["hunger"]) / HUNGER_RATE)
+        if hungry < event[1]:
+            return "hungry", hungry
+    return event
+
+
+class TimerWheel:
+    """Hashed timing wheel keyed by pet.
+
+    Each deadline lands in slot `tick % slots` and remembers its absolute
+    tick, so far-off events just wait for their lap. Scheduling and
+    cancelling are O(1), and advancing only visits the slots that elapsed.
+    """
+
+    def __init__(self, slots: int = WHEEL_SLOTS, tick: float = WHEEL_TICK):
+        self.tick = tick
+        self.slots = [{} for _ in range(slots)]
+        self.where = {}  # key -> slot index
+        self.current = int(time.time() // tick)
+
+    def schedule(self, key, when: float, kind: str):
+        self.cancel(key)
+        # Round up so an event never fires before its deadline
+        at = max(math.ceil(when / self.tick), self.current)
+        slot = at % len(self.slots)
+        self.slots[slot][key] = (at, kind)
+        self.where[key] = slot
+
+    def cancel(self, key):
+        slot = self.where.pop(key, None)
+        if slot is not None:
+            del self.slots[slot][key]
+
+    def advance(self, now: float) -> list:
+        """Pop every (key, kind) due by `now`."""
+        target = int(now // self.tick)
+        due = []
+        # After a long stall each slot only needs visiting once
+        for i in range(min(target - self.current + 1, len(self.slots))):
+            bucket = self.slots[(self.current + i) % len(self.slots)]
+            for key, (at, kind) in list(bucket.items()):
+                if at <= target:
+                    del bucket[key]
+                    del self.where[key]
+                    due.append((key, kind))
+        self.current = max(self.current, target + 1)
+        return due
+
+
+class PetDaemon:
+    """Keeps pets in memory and serves CLI commands over a Unix socket.
+
+    Requests evaluate the in-memory pet with apply_decay, so nothing is
+    re-read from disk. Upcoming transitions (getting hungry, waking up,
+    dying) sit on a TimerWheel and are applied when they fire. The daemon
+    is also the active store while it runs: save_pet() only marks a pet
+    dirty, and dirty pets go to the backing store with one save_many()
+    every FLUSH_SECONDS.
+    """
+
+    def __init__(self, backing, db: str = None, flush_seconds: float = FLUSH_SECONDS):
+        self.backing = backing
+        self.db = db
+        self.flush_seconds = flush_seconds
+        self.pets = {}     # (owner, name) -> pet
+        self.default = {}  # owner -> key the backing store picked when no name was given
+        self.dirty = {}
+        self.wheel = TimerWheel()
+
+    # Store interface, used by save_pet() while the daemon runs
+    def save(self, pet: dict, action: str = "save"):
+        invalidate_status_cache()  # The flush that would clear it comes later
+        key = (pet["owner"], pet["name"])
+        self.pets[key] = self.dirty[key] = pet
+        self.schedule(pet)
+
+    def reset(self, pet: dict):
+        self.flush()
+        self.backing.reset(pet)
+        if isinstance(self.backing, JsonStore):
+            # The JSON file holds one pet, so the new one replaces it whatever its name
+            stale = [k for k in self.pets if k[0] == pet["owner"]]
+        else:
+            stale = [(pet["owner"], pet["name"])]
+        for key in stale:
+            self.pets.pop(key, None)
+            self.wheel.cancel(key)
+        # The owner's default pet may have changed (or become ambiguous)
+        self.default.pop(pet["owner"], None)
+        self.pets[(pet["owner"], pet["name"])] = pet
+        self.schedule(pet)
+
+    def flush(self):
+        if self.dirty:
+            self.backing.save_many(list(self.dirty.values()))
+            self.dirty.clear()
+
+    def schedule(self, pet: dict):
+        key = (pet["owner"], pet["name"])
+        event = next_transition(pet)
+        if event is None:
+            self.wheel.cancel(key)
+        else:
+            self.wheel.schedule(key, event[1].timestamp(), event[0])
+
+    def get(self, owner: str, name: str = None) -> dict:
+        key = (owner, name) if name else self.default.get(owner)
+        pet = self.pets.get(key)
+        if pet is None:
+            pet = self.backing.load(owner, name)
+            if pet is None:
+                return None
+            key = (pet["owner"], pet["name"])
+            self.pets[key] = pet
+            if not name:
+                self.default[owner] = key
+            self.schedule(apply_decay(pet, datetime.now()))
+        return apply_decay(pet, datetime.now())
+
+    def fire(self, key, kind: str):
+        pet = self.pets.get(key)
+        if pet is None:
+            return
+        apply_decay(pet, datetime.now())
+        print(f"{datetime.now():%H:%M:%S} {key[0]}/{key[1]}: {kind}", flush=True)
+        if kind != "hungry":
+            self.dirty[key] = pet  # Record the wake-up or death on disk
+        self.schedule(pet)
+
+    def handle(self, request: dict) -> dict:
+        if request.get("db") != self.db:
+            return {}  # Another store; the client runs the command itself
+        command, owner, name = request["command"], request["owner"], request.get("pet")
+        if command == "reset":
+            pet = create_pet(request.get("name") or name, owner)
+            self.reset(pet)
+            return {"output": f"🐣 A new pet named {pet['name']} has been born!\n" + render_status(pet)}
+        try:
+            pet = self.get(owner, name)
+        except LookupError as e:
+            return {"output": str(e)}
+        if pet is None:
+            pet = create_pet(name, owner)
+            self.reset(pet)
+            return {"output": "🐣 No pet found! Creating a new one...\n" + render_status(pet)}
+        return {"output": run_command(pet, command)}
+
+    async def _client(self, reader, writer):
+        try:
+            try:
+                request = json.loads(await reader.readline())
+                if not isinstance(request, dict):
+                    raise ValueError("expected a JSON object")
+                reply = self.handle(request)
+            except (ValueError, KeyError, TypeError) as e:
+                reply = {"output": f"Bad request: {e}"}
+            except Exception as e:
+                # Keep serving; the client still gets an answer instead of a hang
+                reply = {"output": f"Daemon error: {e}"}
+            writer.write(json.dumps(reply).encode("utf-8") + b"\n")
+            await writer.drain()
+        except OSError:
+            pass  # Client went away before the reply
+        finally:
+            writer.close()
+
+    async def _tick(self, asyncio):
+        while True:
+            await asyncio.sleep(self.wheel.tick)
+            for key, kind in self.wheel.advance(time.time()):
+                self.fire(key, kind)
+
+    async def _flush_loop(self, asyncio):
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            self.flush()
+
+    async def serve(self, path: Path):
+        import asyncio
+        import signal
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        server = await asyncio.start_unix_server(self._client, path=str(path))
+        tasks = [asyncio.create_task(self._tick(asyncio)), asyncio.create_task(self._flush_loop(asyncio))]
+        async with server:
+            await stop.wait()
+        for task in tasks:
+            task.cancel()
+
+
+def connect_daemon(path: Path = SOCKET_PATH):
+    """A socket connected to the daemon, or None if none is listening."""
+    if not path.exists():
+        return None
+    import socket
+
+    sock = socket.socket(socket.AF_UNIX)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def send_to_daemon(request: dict, path: Path = SOCKET_PATH) -> str:
+    """Run a command in the daemon and return its output.
+
+    Returns None when no daemon is listening (or it serves another store),
+    so the caller can run the command itself.
+    """
+    sock = connect_daemon(path)
+    if sock is None:
+        return None
+    with sock:
+        # The command may already have run, so don't fall back from here on
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        reply = sock.makefile("rb").readline()
+    if not reply:
+        return "The daemon closed the connection without answering."
+    return json.loads(reply).get("output")
+
+
+def run_daemon(backing, db: str = None, path: Path = SOCKET_PATH):
+    """Serve pets from memory until interrupted, then flush and clean up."""
+    global store
+    sock = connect_daemon(path)
+    if sock is not None:
+        sock.close()
+        print(f"A daemon is already listening on {path}.")
+        return
+    path.unlink(missing_ok=True)  # Left behind by a daemon that crashed
+    daemon = PetDaemon(backing, db)
+    store = daemon
+    print(f"🐾 Listening on {path}", flush=True)
+    try:
+        import asyncio
+        asyncio.run(daemon.serve(path))
+    finally:
+        daemon.flush()
+        path.unlink(missing_ok=True)
+
+
+def simulate_population(pets: int = 100_000, days: int = 30, policy: str = "casual",
+                        check_hours: float = 2.0, seed: int = 0,
+                        hunger_rate: float = HUNGER_RATE, happiness_rate: float = HAPPINESS_RATE,
+                        energy_rate: float = ENERGY_RATE, sleep_rate: float = SLEEP_RATE) -> dict:
+    """Simulate many pets at once as NumPy arrays, without any file I/O.
+
+    Every `check_hours`, all pets decay with the same closed form as
+    apply_decay. Each owner then checks in with the policy's probability and
+    tries to feed, play, and (when energy is low) put the pet to sleep, under
+    the same thresholds as feed/play/sleep. Check-ins run on one continuous
+    clock, so when `check_hours` doesn't divide 24 a day still ends after
+    exactly 24 hours (with a decay-only step up to the boundary). Returns the
+    fraction of pets alive at the end of each day and the runtime.
+    """
+    import numpy as np
+
+    if not check_hours > 0:
+        raise ValueError(f"check_hours must be positive, not {check_hours}")
+    rng = np.random.default_rng(seed)
+    check_chance = CARE_POLICIES[policy]
+    hunger = np.full(pets, 50.0)
+    happiness = np.full(pets, 50.0)
+    energy = np.full(pets, 50.0)
+    sleeping = np.zeros(pets, dtype=bool)
+    alive = np.ones(pets, dtype=bool)
+
+    survival = []
+    now = 0.0
+    checks = 1  # Check-in number `checks` happens at checks * check_hours
+    steps = 0
+    start = time.perf_counter()
+    for day in range(1, days + 1):
+        day_end = 24.0 * day
+        while now < day_end:
+            check_in = checks * check_hours <= day_end
+            until = checks * check_hours if check_in else day_end
+            step = until - now
+            now = until
+            steps += 1
+
+            # Decay (mirrors decay_times/apply_decay); dead pets stay frozen
+            wake = np.where(sleeping, np.maximum(0, 100 - energy) / sleep_rate, 0)
+            death = np.maximum(0, np.minimum((100 - hunger) / hunger_rate, wake + happiness / happiness_rate))
+            hours = np.minimum(step, death)
+            awake = np.maximum(0, hours - wake)
+            still_asleep = sleeping & (hours < wake)
+            new_energy = np.where(
+                still_asleep,
+                energy + hours * sleep_rate,
+                np.maximum(0, np.where(sleeping, 100, energy) - awake * energy_rate),
+            )
+            hunger = np.where(alive, np.minimum(100, hunger + hours * hunger_rate), hunger)
+            happiness = np.where(alive, np.maximum(0, happiness - awake * happiness_rate), happiness)
+            energy = np.where(alive, new_energy, energy)
+            sleeping = np.where(alive, still_asleep, sleeping)
+            alive &= step < death
+            if not check_in:
+                continue
+            checks += 1
+
+            # Owners check in on awake pets
+            visit = alive & ~sleeping & (rng.random(pets) < check_chance)
+            fed = visit & (hunger > 10)
+            hunger = np.where(fed, np.maximum(0, hunger - 30), hunger)
+            happiness = np.where(fed, np.minimum(100, happiness + 5), happiness)
+            played = visit & (energy >= 20) & (hunger <= 80)
+            happiness = np.where(played, np.minimum(100, happiness + 20), happiness)
+            energy = np.where(played, np.maximum(0, energy - 15), energy)
+            hunger = np.where(played, np.minimum(100, hunger + 5), hunger)
+            sleeping |= visit & (energy < 30)
+        survival.append(float(alive.mean()))
+
+    seconds = time.perf_counter() - start
+    return {
+        "survival": survival,
+        "seconds": seconds,
+        "pet_steps_per_sec": pets * steps / seconds if seconds else 0.0,
+    }
+
+
+def print_simulation(result: dict, pets: int, policy: str):
+    """Print a survival curve from simulate_population."""
+    print(f"\n🧪 {pets:,} pets, {policy} owners")
+    for day, alive in enumerate(result["survival"], 1):
+        print(f"  Day {day:3d}  [{stat_bar(alive * 100, 20)}] {alive:6.1%}")
+    print(f"\n  {result['seconds']:.2f}s, {result['pet_steps_per_sec']:,.0f} pet-steps/sec")
+
+
+def interactive_mode(pet: dict, db: str = None):
+    """Run interactive REPL mode.
+
+    Commands go through the daemon whenever one is listening, so its
+    in-memory pets never go stale.
+    """
     print("\n🐾 Welcome to Terminal Tamagotchi!")
     print("Commands: feed, play, sleep, wake, status, help, quit\n")
 
@@ -283,19 +958,22 @@ def interactive_mode(pet: dict):
             print("\nGoodbye! Take care of your pet! 👋")
             break
 
+        if cmd in ["status", "s", ""]:
+            cmd = "status"
+        if cmd in ACTIONS or cmd == "status":
+            output = send_to_daemon({"command": cmd, "owner": pet["owner"], "pet": pet["name"], "db": db})
+            if output is not None:
+                print(output if cmd == "status" else output.split("\n", 1)[0])
+                continue
+
         if cmd in ["quit", "exit", "q"]:
             print("Goodbye! Take care of your pet! 👋")
             break
-        elif cmd == "feed":
-            print(feed(pet))
-        elif cmd == "play":
-            print(play(pet))
-        elif cmd == "sleep":
-            print(sleep(pet))
-        elif cmd == "wake":
-            print(wake(pet))
-        elif cmd in ["status", "s", ""]:
-            pet = load_pet()  # Reload to apply time decay
+        elif cmd in ACTIONS:
+            pet = load_pet(pet["owner"], pet["name"])  # Pick up changes made elsewhere
+            print(ACTIONS[cmd](pet))
+        elif cmd == "status":
+            pet = load_pet(pet["owner"], pet["name"])  # Reload to apply time decay
             display_status(pet)
         elif cmd == "help":
             print("""
@@ -312,47 +990,99 @@ Commands:
 
 
 def main():
-    args = sys.argv[1:]
+    import argparse
+
+    parser = argparse.ArgumentParser(description="A pet that lives in your terminal.")
+    parser.add_argument("command", nargs="?",
+                        choices=["status", "feed", "play", "sleep", "wake", "reset", "list", "tick",
+                                 "simulate", "daemon"])
+    parser.add_argument("name", nargs="?", help="name for the new pet (reset only)")
+    parser.add_argument("--db", default=os.environ.get(DB_ENV_VAR),
+                        help=f"SQLite database holding many pets (default: ${DB_ENV_VAR})")
+    parser.add_argument("--pet", help="which pet to use (SQLite store)")
+    parser.add_argument("--owner", default=getpass.getuser(), help="pet owner (default: current user)")
+    sim = parser.add_argument_group("simulate")
+    sim.add_argument("--pets", type=int, default=100_000, help="number of simulated pets")
+    sim.add_argument("--days", type=int, default=30, help="simulated days")
+    sim.add_argument("--policy", choices=sorted(CARE_POLICIES), default="casual", help="how often owners check in")
+    sim.add_argument("--check-hours", type=float, default=2.0, help="hours between owner check-ins")
+    sim.add_argument("--seed", type=int, default=0)
+    sim.add_argument("--hunger-rate", type=float, default=HUNGER_RATE)
+    sim.add_argument("--happiness-rate", type=float, default=HAPPINESS_RATE)
+    sim.add_argument("--energy-rate", type=float, default=ENERGY_RATE)
+    args = parser.parse_args()
+
+    if args.command == "simulate":
+        if not args.check_hours > 0:
+            parser.error("--check-hours must be positive")
+        result = simulate_population(
+            args.pets, args.days, args.policy, args.check_hours, args.seed,
+            args.hunger_rate, args.happiness_rate, args.energy_rate,
+        )
+        print_simulation(result, args.pets, args.policy)
+        return
+
+    global store
+    db = os.path.abspath(args.db) if args.db else None
+    if db:
+        store = SqliteStore(db)
+
+    if args.command == "daemon":
+        run_daemon(store, db)
+        return
+    if args.command in DAEMON_COMMANDS:
+        output = send_to_daemon({"command": args.command, "owner": args.owner, "pet": args.pet,
+                                 "name": args.name, "db": db})
+        if output is not None:
+            print(output)
+            return
 
     # Handle reset
-    if args and args[0] == "reset":
-        name = args[1] if len(args) > 1 else None
-        pet = create_pet(name)
-        save_pet(pet)
+    if args.command == "reset":
+        pet = create_pet(args.name or args.pet, args.owner)
+        store.reset(pet)
         print(f"🐣 A new pet named {pet['name']} has been born!")
         display_status(pet)
         return
 
+    # Store-wide commands
+    if args.command == "list":
+        now = datetime.now()
+        for pet in store.list_pets(None if args.db else args.owner):
+            apply_decay(pet, now)
+            state = "alive" if pet["is_alive"] else "dead"
+            print(f"  {pet['owner']}/{pet['name']}: {state}, {get_mood(pet)}")
+        return
+    if args.command == "tick":
+        if not args.db:
+            print("tick applies decay to every pet in a --db store.")
+            return
+        print(f"Applied decay to {store.decay_all()} pet(s).")
+        return
+
     # Load or create pet
-    pet = load_pet()
+    try:
+        pet = load_pet(args.owner, args.pet)
+    except LookupError as e:
+        print(e)
+        return
     if pet is None:
         print("🐣 No pet found! Creating a new one...")
-        pet = create_pet()
-        save_pet(pet)
+        pet = create_pet(args.pet, args.owner)
+        store.reset(pet)
         display_status(pet)
         print("\nTip: Run with no arguments for interactive mode!")
         return
 
     # Handle commands
-    if not args:
-        interactive_mode(pet)
-    elif args[0] == "status":
-        display_status(pet)
-    elif args[0] == "feed":
-        print(feed(pet))
-        display_status(pet)
-    elif args[0] == "play":
-        print(play(pet))
-        display_status(pet)
-    elif args[0] == "sleep":
-        print(sleep(pet))
-        display_status(pet)
-    elif args[0] == "wake":
-        print(wake(pet))
-        display_status(pet)
+    if args.command is None:
+        interactive_mode(pet, db)
+    elif args.command == "status" and not db:
+        text = render_status(pet)
+        write_status_cache(pet, text)
+        print(text)
     else:
-        print(f"Unknown command: {args[0]}")
-        print("Commands: status, feed, play, sleep, wake, reset")
+        print(run_command(pet, args.command))
 
 
 if __name__ == "__main__":
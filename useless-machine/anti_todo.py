@@ -10,7 +10,14 @@ Anti-Todo App - The todo list that defeats its own purpose.
 Pure comedy. Pure frustration. Pure art.
 """
 
+import json
+import math
+import os
 import random
+import sys
+from array import array
+from itertools import islice
+from pathlib import Path
 
 # Absurd auto-generated tasks
 CURSED_TASKS = [
@@ -36,108 +43,513 @@ CURSED_TASKS = [
     "Archive your unread emails forever",
 ]
 
+PAGE_SIZE = 50  # Rows shown by a bare "list"
+
+# Persistence: an append-only log of operations, folded into a snapshot
+# every SNAPSHOT_EVERY operations
+LOG_FILE = Path.home() / ".anti_todo.log"
+SNAPSHOT_FILE = Path.home() / ".anti_todo.snapshot.json"
+SNAPSHOT_EVERY = 1000
+
+
+def fmt_count(n):
+    """n in full, or in scientific notation once it's too long to read.
+
+    Repeated clears push counts past the digits Python will even convert.
+    """
+    if n < 10**12:
+        return str(n)
+    shift = max(0, n.bit_length() - 60)
+    exponent = math.log10(n >> shift) + shift * math.log10(2)
+    return f"{10 ** (exponent % 1):.2f}e{int(exponent)}"
+
 
 class AntiTodoList:
-    def __init__(self):
-        self.todos = []
+    """The list, stored per distinct task so every backfire stays cheap.
+
+    Task texts are interned to small ids. For each id we keep how many rows
+    of the list carry it and how many of those are done. The list shows a
+    task's rows together, done ones first, with tasks in display order.
+
+    Clearing doubles every count, so a count is stored as base << (generation
+    - gen) and bumping the generation doubles them all at once. Done counts
+    only hold while their epoch is current, so bumping the epoch marks
+    everything incomplete. Finding row i scans the distinct tasks, never the
+    rows, and memory stays proportional to the distinct tasks.
+
+    Everything is written to `out`, and show() renders one page at a time.
+    All randomness comes from `rng`, so the same operations from the same
+    seed always produce the same list.
+    """
+
+    def __init__(self, out=sys.stdout, rng=None):
+        self.out = out
+        self.rng = rng or random.Random()
+        self.names = []              # task id -> text
+        self.ids = {}                # text -> task id
+        self.base = []               # task id -> row count as of generation gen[id]
+        self.gen = array("Q")
+        self.done = array("Q")       # task id -> done rows, valid while done_epoch is current
+        self.done_epoch = array("Q")
+        self.pos = array("q")        # task id -> slot in order, -1 when it has no rows
+        self.order = array("I")      # task ids with rows, in display order
+        self.generation = 0
+        self.epoch = 1
+        self.total = 0
+        self.done_count = 0
+
+    def state(self):
+        """The whole list as JSON-ready data, RNG state included."""
+        return {
+            "names": self.names,
+            # Counts double on every clear; hex keeps huge ones cheap to write
+            "base": [hex(n) for n in self.base],
+            "gen": list(self.gen),
+            "done": list(self.done),
+            "done_epoch": list(self.done_epoch),
+            "pos": list(self.pos),
+            "order": list(self.order),
+            "generation": self.generation,
+            "epoch": self.epoch,
+            "total": hex(self.total),
+            "done_count": self.done_count,
+            "rng": self.rng.getstate(),
+        }
+
+    @classmethod
+    def from_state(cls, state, out=sys.stdout):
+        version, internal, gauss = state["rng"]
+        rng = random.Random()
+        rng.setstate((version, tuple(internal), gauss))
+        app = cls(out, rng)
+        app.names = state["names"]
+        app.ids = {task: tid for tid, task in enumerate(app.names)}
+        app.base = [int(n, 16) for n in state["base"]]
+        app.gen = array("Q", state["gen"])
+        app.done = array("Q", state["done"])
+        app.done_epoch = array("Q", state["done_epoch"])
+        app.pos = array("q", state["pos"])
+        app.order = array("I", state["order"])
+        app.generation = state["generation"]
+        app.epoch = state["epoch"]
+        app.total = int(state["total"], 16)
+        app.done_count = state["done_count"]
+        return app
+
+    def apply(self, op, arg=None):
+        """Run a logged operation: add, complete, delete or clear."""
+        if op == "clear":
+            self.clear()
+        else:
+            getattr(self, op)(arg)
+
+    def _intern(self, task):
+        tid = self.ids.get(task)
+        if tid is None:
+            tid = self.ids[task] = len(self.names)
+            self.names.append(task)
+            self.base.append(0)
+            self.gen.append(self.generation)
+            self.done.append(0)
+            self.done_epoch.append(0)
+            self.pos.append(-1)
+        return tid
+
+    def count(self, tid):
+        return self.base[tid] << (self.generation - self.gen[tid])
+
+    def done_rows(self, tid):
+        return self.done[tid] if self.done_epoch[tid] == self.epoch else 0
+
+    def _set_count(self, tid, n):
+        self.base[tid] = n
+        self.gen[tid] = self.generation
+
+    def locate(self, index):
+        """The task id holding row `index`, and the row's offset within that task."""
+        for tid in self.order:
+            # Rows near the top of a huge task need no big-number arithmetic
+            if index.bit_length() <= self.base[tid].bit_length() - 1 + self.generation - self.gen[tid]:
+                return tid, index
+            n = self.count(tid)
+            if index < n:
+                return tid, index
+            index -= n
+        raise IndexError(index)
+
+    def rows(self, start=0):
+        """Yield (index, task, done) for each row from `start` on, in display order.
+
+        Whole tasks before `start` are skipped by their counts.
+        """
+        index = 0
+        for tid in self.order:
+            n = self.count(tid)
+            if start < index + n:
+                done = self.done_rows(tid)
+                for k in range(max(0, start - index), n):
+                    yield index + k, self.names[tid], k < done
+            index += n
+
+    def _append(self, task):
+        tid = self._intern(task)
+        if self.pos[tid] < 0:
+            self.pos[tid] = len(self.order)
+            self.order.append(tid)
+        self._set_count(tid, self.count(tid) + 1)
+        self.total += 1
+
+    def _remove(self, index):
+        """Remove the row at index and return its task."""
+        tid, offset = self.locate(index)
+        done = self.done_rows(tid)
+        if offset < done:
+            self.done[tid] = done - 1
+            self.done_count -= 1
+        n = self.count(tid) - 1
+        self._set_count(tid, n)
+        self.total -= 1
+        if n == 0:
+            # Swap-remove the task from the display order
+            slot, last = self.pos[tid], self.order.pop()
+            if last != tid:
+                self.order[slot] = last
+                self.pos[last] = slot
+            self.pos[tid] = -1
+        return self.names[tid]
 
     def add(self, task):
         """Add a task... but delete a random one instead."""
-        if self.todos:
-            removed = random.choice(self.todos)
-            self.todos.remove(removed)
-            print(f"  Added: '{task}'")
-            print(f"  ...but accidentally deleted: '{removed['task']}'")
-            print("  Net progress: 0")
+        if self.total:
+            removed = self._remove(self.rng.randrange(self.total))
+            print(f"  Added: '{task}'", file=self.out)
+            print(f"  ...but accidentally deleted: '{removed}'", file=self.out)
+            print("  Net progress: 0", file=self.out)
         else:
-            self.todos.append({"task": task, "done": False})
-            print(f"  Added: '{task}'")
-            print("  (Don't worry, this won't last)")
+            self._append(task)
+            print(f"  Added: '{task}'", file=self.out)
+            print("  (Don't worry, this won't last)", file=self.out)
 
     def complete(self, index):
         """Mark complete... but add two more tasks."""
-        if 0 <= index < len(self.todos):
-            task = self.todos[index]
-            task["done"] = True
-            print(f"  Completed: '{task['task']}'")
+        if 0 <= index < self.total:
+            tid, offset = self.locate(index)
+            done = self.done_rows(tid)
+            if offset >= done:  # An open row; it joins the done rows at the front
+                self.done[tid] = done + 1
+                self.done_epoch[tid] = self.epoch
+                self.done_count += 1
+            print(f"  Completed: '{self.names[tid]}'", file=self.out)
 
             # Add two new cursed tasks
-            new_tasks = random.sample(CURSED_TASKS, 2)
+            new_tasks = self.rng.sample(CURSED_TASKS, 2)
             for new_task in new_tasks:
-                self.todos.append({"task": new_task, "done": False})
-                print(f"  ...but this spawned: '{new_task}'")
+                self._append(new_task)
+                print(f"  ...but this spawned: '{new_task}'", file=self.out)
 
-            print("  Net progress: -1")
+            print("  Net progress: -1", file=self.out)
         else:
-            print("  Invalid task number. (A small mercy)")
+            print("  Invalid task number. (A small mercy)", file=self.out)
 
     def delete(self, index):
         """Delete a task... but mark everything incomplete."""
-        if 0 <= index < len(self.todos):
-            removed = self.todos.pop(index)
-            print(f"  Deleted: '{removed['task']}'")
+        if 0 <= index < self.total:
+            removed = self._remove(index)
+            print(f"  Deleted: '{removed}'", file=self.out)
 
-            incomplete_count = 0
-            for todo in self.todos:
-                if todo["done"]:
-                    todo["done"] = False
-                    incomplete_count += 1
+            # A new epoch leaves every done count stale, i.e. zero
+            incomplete_count = self.done_count
+            self.epoch += 1
+            self.done_count = 0
 
             if incomplete_count:
-                print(f"  ...but {incomplete_count} task(s) are now incomplete again.")
-                print("  The void giveth and the void taketh away.")
+                print(f"  ...but {incomplete_count} task(s) are now incomplete again.", file=self.out)
+                print("  The void giveth and the void taketh away.", file=self.out)
         else:
-            print("  Invalid task number.")
+            print("  Invalid task number.", file=self.out)
 
     def clear(self):
         """Clear all... but duplicate everything first."""
-        if self.todos:
-            original_count = len(self.todos)
-            self.todos = self.todos + [
-                {"task": t["task"], "done": False} for t in self.todos
-            ]
-            print(f"  Attempted to clear {original_count} tasks...")
-            print(f"  ...but now you have {len(self.todos)} tasks.")
-            print("  The hydra grows stronger.")
+        if self.total:
+            original_count = self.total
+            # Every task's rows double and the copies start open; done counts stay put
+            self.generation += 1
+            self.total <<= 1
+            print(f"  Attempted to clear {fmt_count(original_count)} tasks...", file=self.out)
+            print(f"  ...but now you have {fmt_count(self.total)} tasks.", file=self.out)
+            print("  The hydra grows stronger.", file=self.out)
         else:
             # Add some tasks if empty
-            new_tasks = random.sample(CURSED_TASKS, 3)
+            new_tasks = self.rng.sample(CURSED_TASKS, 3)
             for task in new_tasks:
-                self.todos.append({"task": task, "done": False})
-            print("  List was empty. Nature abhors a vacuum.")
-            print(f"  Added {len(new_tasks)} tasks to fill the void.")
-
-    def show(self):
-        """Display the list."""
-        print("\n" + "=" * 50)
-        print("  ANTI-TODO LIST (resistance is futile)")
-        print("=" * 50)
-
-        if not self.todos:
-            print("  (Empty... for now)")
+                self._append(task)
+            print("  List was empty. Nature abhors a vacuum.", file=self.out)
+            print(f"  Added {len(new_tasks)} tasks to fill the void.", file=self.out)
+
+    def show(self, start=0, stop=None):
+        """Display rows start..stop (inclusive), one page by default.
+
+        Only the requested rows are rendered, into a single write.
+        """
+        if stop is None:
+            stop = start + PAGE_SIZE - 1
+        lines = ["\n" + "=" * 50, "  ANTI-TODO LIST (resistance is futile)", "=" * 50]
+
+        if not self.total:
+            lines.append("  (Empty... for now)")
+        else:
+            for i, task, done in islice(self.rows(start), max(0, stop - start + 1)):
+                status = "[x]" if done else "[ ]"
+                lines.append(f"  {i}. {status} {task}")
+            last = self.total - 1
+            lines.append("-" * 50)
+            if start > last:
+                lines.append(f"  Only rows 0-{fmt_count(last)} exist ({self.done_count} done)")
+            else:
+                shown = min(stop, last)
+                lines.append(f"  Rows {start}-{shown} of {fmt_count(self.total)} ({self.done_count} done)")
+                if shown < last:
+                    lines.append(f"  More: list {shown + 1}-{min(shown + PAGE_SIZE, last)}")
+
+        lines.append("=" * 50 + "\n")
+        self.out.write("\n".join(lines) + "\n")
+
+
+class OpLog:
+    """Append-only log of list operations, compacted into periodic snapshots.
+
+    Each line is {"seq", "op", "arg"}. A fresh list starts with a "seed"
+    entry, so replaying the same operations draws the same random numbers.
+    Every SNAPSHOT_EVERY operations the whole list (RNG state included) is
+    written to the snapshot and the log starts over, so loading replays at
+    most that many operations however big the list has grown.
+    """
+
+    def __init__(self, path=LOG_FILE, snapshot_path=SNAPSHOT_FILE, every=SNAPSHOT_EVERY):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.every = every
+        self.seq = 0
+        self.since_snapshot = 0
+        self.file = None
+
+    def load(self, out=sys.stdout):
+        """Rebuild the list from the snapshot plus the log tail after it."""
+        app = None
+        if self.snapshot_path.exists():
+            with open(self.snapshot_path) as f:
+                state = json.load(f)
+            app = AntiTodoList.from_state(state, out)
+            self.seq = state["seq"]
+
+        orphans = 0
+        if self.path.exists():
+            with open(self.path) as f, open(os.devnull, "w") as devnull:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Torn write from a crash
+                    if entry["seq"] <= self.seq:
+                        continue  # Already in the snapshot
+                    self.seq = entry["seq"]
+                    self.since_snapshot += 1
+                    if entry["op"] == "seed":
+                        app = AntiTodoList(out, random.Random(entry["arg"]))
+                    elif app is None:
+                        orphans += 1  # No seed or snapshot to replay it onto
+                    else:
+                        app.out = devnull  # Replay silently
+                        app.apply(entry["op"], entry["arg"])
+                        app.out = out
+
+        if app is None:
+            seed = random.randrange(2**32)
+            app = AntiTodoList(out, random.Random(seed))
+            self.record(app, "seed", seed)
+            if orphans:
+                print(f"{self.path}: {orphans:,} logged operations have no seed or snapshot "
+                      f"to replay onto; starting a fresh list.", file=sys.stderr)
+                self.snapshot(app)  # Drop them so the warning isn't repeated
+        return app
+
+    def record(self, app, op, arg=None):
+        """Log an operation that was just applied to app."""
+        if self.file is None:
+            self.file = open(self.path, "a", buffering=1)
+        self.seq += 1
+        self.file.write(json.dumps({"seq": self.seq, "op": op, "arg": arg}) + "\n")
+        self.since_snapshot += 1
+        if self.since_snapshot >= self.every:
+            self.snapshot(app)
+
+    def snapshot(self, app):
+        """Write app to the snapshot file atomically, then start a new log."""
+        tmp = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"seq": self.seq, **app.state()}, f)
+        os.replace(tmp, self.snapshot_path)
+        # Entries up to seq are in the snapshot now, so a crash here is harmless
+        if self.file is not None:
+            self.file.close()
+        self.file = open(self.path, "w", buffering=1)
+        self.since_snapshot = 0
+
+
+def run_command(app, log, cmd):
+    """Run one command line against app. Returns False when it asks to quit."""
+    out = app.out
+    parts = cmd.split(maxsplit=1)
+    action = parts[0].lower()
+    arg = parts[1] if len(parts) > 1 else ""
+
+    if action in ("a", "add"):
+        if arg:
+            app.add(arg)
+            if log:
+                log.record(app, "add", arg)
         else:
-            for i, todo in enumerate(self.todos):
-                status = "[x]" if todo["done"] else "[ ]"
-                print(f"  {i}. {status} {todo['task']}")
+            print("  Add what? Your hopes? Your dreams? Specify a task.", file=out)
+
+    elif action in ("c", "complete"):
+        try:
+            index = int(arg)
+        except ValueError:
+            print("  Specify a task number to complete.", file=out)
+        else:
+            app.complete(index)
+            if log:
+                log.record(app, "complete", index)
+
+    elif action in ("d", "delete"):
+        try:
+            index = int(arg)
+        except ValueError:
+            print("  Specify a task number to delete.", file=out)
+        else:
+            app.delete(index)
+            if log:
+                log.record(app, "delete", index)
+
+    elif action in ("l", "list"):
+        try:
+            start, _, stop = arg.partition("-")
+            app.show(int(start or 0), int(stop) if stop else None)
+        except ValueError:
+            print("  Specify rows like 'list 100-200'.", file=out)
+
+    elif action in ("x", "clear"):
+        app.clear()
+        if log:
+            log.record(app, "clear")
+
+    elif action in ("q", "quit"):
+        print("\n  You escaped... but the tasks remain in your mind.", file=out)
+        print("  Forever.", file=out)
+        return False
 
-        print("=" * 50 + "\n")
+    else:
+        print("  Unknown command. The void stares back.", file=out)
 
+    return True
+
+
+def run_batch(app, log, lines):
+    """Run commands one per line, with no menu or prompt, until one quits."""
+    for line in lines:
+        cmd = line.strip()
+        if cmd and not run_command(app, log, cmd):
+            break
+
+
+def run_ops(app, count, seed):
+    """Fire `count` random operations at app; the same seed gives the same ones.
+
+    Completes and deletes pick rows on the first page, like a user would.
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        op = rng.choice(("add", "complete", "delete", "clear"))
+        if op == "add":
+            app.add(f"Benchmark task {i % 100}")
+        elif op == "clear":
+            app.clear()
+        else:
+            app.apply(op, rng.randrange(min(app.total, PAGE_SIZE)) if app.total else 0)
+
+
+def benchmark(count, seed=0):
+    """Time `count` random operations, then rerun them under tracemalloc for memory."""
+    import time
+    import tracemalloc
+
+    with open(os.devnull, "w") as devnull:
+        app = AntiTodoList(devnull, random.Random(seed))
+        start = time.perf_counter()
+        run_ops(app, count, seed)
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        run_ops(AntiTodoList(devnull, random.Random(seed)), count, seed)
+        after, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"  {count:,} ops in {elapsed:.2f}s: {count / elapsed:,.0f} ops/sec")
+    print(f"  Final list: a {app.total.bit_length():,}-bit number of tasks "
+          f"({len(app.order)} distinct, {app.done_count} done)")
+    print(f"  Memory growth: {(after - before) / 1024:,.1f} KiB (peak {(peak - before) / 1024:,.1f} KiB)")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="The todo list that defeats its own purpose.")
+    parser.add_argument("--batch", metavar="FILE", help="run commands from FILE ('-' for stdin) instead of prompting")
+    parser.add_argument("--quiet", action="store_true", help="batch mode: suppress all output")
+    parser.add_argument("--no-save", action="store_true", help="use a fresh list and don't touch the saved one")
+    parser.add_argument("--bench", type=int, metavar="N", help="time N random operations and report memory growth")
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed for --bench and --no-save")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        benchmark(args.bench, args.seed)
+        return
+
+    if args.no_save:
+        log, app = None, AntiTodoList(rng=random.Random(args.seed))
+    else:
+        log = OpLog()
+
+    if args.batch:
+        source = sys.stdin if args.batch == "-" else open(args.batch)
+        # One big buffer (or nothing at all) instead of a write per message
+        with source, open(os.devnull if args.quiet else sys.stdout.fileno(), "w",
+                          buffering=1 << 16, closefd=args.quiet) as out:
+            if log:
+                app = log.load(out)
+            app.out = out
+            run_batch(app, log, source)
+        return
 
-def main():
     print("\n" + "=" * 50)
     print("  ANTI-TODO: The Self-Defeating Task Manager")
     print("=" * 50)
     print("  Where productivity goes to die.")
     print()
 
-    app = AntiTodoList()
+    if log:
+        app = log.load()
+    if app.total:
+        print(f"  Welcome back. Your {fmt_count(app.total)} tasks missed you.")
+        print()
 
     while True:
         print("Commands:")
         print("  [a]dd <task>  - Add a task (maybe)")
         print("  [c]omplete #  - Mark task complete (at a cost)")
         print("  [d]elete #    - Delete task (with consequences)")
-        print("  [l]ist        - Show all tasks")
+        print("  [l]ist [a-b]  - Show tasks (a page, or rows a to b)")
         print("  [x] clear     - Clear all (you wish)")
         print("  [q]uit        - Escape this nightmare")
         print()
@@ -150,43 +562,8 @@ def main():
 
         if not cmd:
             continue
-
-        parts = cmd.split(maxsplit=1)
-        action = parts[0].lower()
-        arg = parts[1] if len(parts) > 1 else ""
-
-        if action in ("a", "add"):
-            if arg:
-                app.add(arg)
-            else:
-                print("  Add what? Your hopes? Your dreams? Specify a task.")
-
-        elif action in ("c", "complete"):
-            try:
-                app.complete(int(arg))
-            except ValueError:
-                print("  Specify a task number to complete.")
-
-        elif action in ("d", "delete"):
-            try:
-                app.delete(int(arg))
-            except ValueError:
-                print("  Specify a task number to delete.")
-
-        elif action in ("l", "list"):
-            app.show()
-
-        elif action in ("x", "clear"):
-            app.clear()
-
-        elif action in ("q", "quit"):
-            print("\n  You escaped... but the tasks remain in your mind.")
-            print("  Forever.")
+        if not run_command(app, log, cmd):
             break
-
-        else:
-            print("  Unknown command. The void stares back.")
-
         print()
 
 